@@ -33,6 +33,41 @@ else:
 
 path = (str, unicode)
 
+try:
+    from collections import OrderedDict
+except ImportError:  # pragma: no cover
+    # python2.6 has no OrderedDict, its dicts are in arbitrary order
+    OrderedDict = dict
+
+if sys.version_info >= (3, 9):  # pragma: no cover
+    import hashlib
+    from functools import partial
+    # the hashes identify objects and are no security measure
+    sha1 = partial(hashlib.sha1, usedforsecurity=False)
+else:
+    from hashlib import sha1
+
+if sys.version_info >= (3, 8):  # pragma: no cover
+    # copies in the kernel (e.g. with sendfile) where possible
+    from shutil import copyfile
+else:
+    def copyfile(src, dst, length=1024 * 1024):
+        """
+        Copy the contents of the file ``src`` to ``dst`` in chunks of
+        ``length`` bytes (larger than the default of :mod:`shutil`).
+
+        :param src: path of the file to copy
+        :type src: str
+        :param dst: path of the copy
+        :type dst: str
+        :param length: size of the chunks
+        :type length: int
+        """
+        import shutil
+        with open(src, 'rb') as fsrc:
+            with open(dst, 'wb') as fdst:
+                shutil.copyfileobj(fsrc, fdst, length)
+
 if sys.version_info >= (2, 7):  # pragma: no cover
     import unittest
     # avoiding AttributeErrors is quite difficult here...
@@ -148,3 +183,20 @@ def try_unicode(string):
         return string.decode("utf-8")
     else:
         return string
+
+
+def native(string, codec='utf8'):
+    """
+    Return the native string (``bytes`` on python2, ``unicode`` on python3) of
+    the encoded ``string``.
+
+    :param string: string to decode
+    :type string: str (bytes)
+    :param codec: how to decode on python3
+    :returns: the native string
+    :rtype: str (native)
+    """
+    if on_python3:  # pragma: no cover
+        return string.decode(codec)
+    else:
+        return string
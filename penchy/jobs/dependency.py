@@ -8,6 +8,8 @@ pipeline.
  :license: MIT License, see LICENSE
 """
 
+from collections import deque
+
 from penchy.compat import str, unicode
 
 
@@ -137,7 +139,8 @@ def edgesort(starts, edges):
 
     ``starts`` won't be included.
 
-    :raises: :exc:`ValueError` if no topological sort is possible
+    :raises: :exc:`ValueError` if no topological sort is possible or an edge
+             leads into one of ``starts``
     :param starts: Sequence of :class:`~penchy.jobs.elements.PipelineElement`
                    that have no dependencies
     :param edges: Sequence of :class:`~penchy.jobs.job.Edge`
@@ -145,27 +148,40 @@ def edgesort(starts, edges):
               :class:`~penchy.jobs.elements.PipelineElement` and sorted list of
               corresponding :class:`~penchy.jobs.job.Edge`
     """
-    resolved = set(starts)
+    # Kahn's algorithm: a sink is resolved once all its edges are resolved
+    incoming = {}
+    outgoing = {}
+    for edge in edges:
+        incoming.setdefault(edge.sink, []).append(edge)
+        outgoing.setdefault(edge.source, []).append(edge.sink)
+    pending = dict((sink, len(sink_edges))
+                   for sink, sink_edges in incoming.items())
+
+    resolved = set()
+    queue = deque()
+    for start in starts:
+        # the edges would never be resolved and silently left out
+        if start in incoming:
+            raise ValueError("start {0} is the sink of an edge".format(start))
+        if start not in resolved:
+            resolved.add(start)
+            queue.append(start)
+
     order = []
     edge_order = []
-    edges = list(edges)
-    old_edges = []
-    while True:
-        if not edges:
-            return order, edge_order
-
-        if edges == old_edges:
-            raise ValueError("no topological sort possible")
-
-        for target in set(edge.sink for edge in edges):
-            current = [edge for edge in edges if edge.sink is target]
-            if all(edge.source in resolved for edge in current):
-                resolved.add(target)
-                order.append(target)
-                edge_order.extend(current)
-
-        old_edges = list(edges)
-        edges = [edge for edge in edges if edge.sink not in resolved]
+    while queue:
+        for sink in outgoing.get(queue.popleft(), ()):
+            pending[sink] -= 1
+            if not pending[sink] and sink not in resolved:
+                resolved.add(sink)
+                order.append(sink)
+                edge_order.extend(incoming[sink])
+                queue.append(sink)
+
+    if any(sink not in resolved for sink in incoming):
+        raise ValueError("no topological sort possible")
+
+    return order, edge_order
 
 
 def build_keys(edges):
@@ -9,7 +9,7 @@ This module provides the foundation of job elements.
 import logging
 from collections import defaultdict
 
-from penchy.compat import path
+from penchy.compat import OrderedDict, path
 from penchy.jobs.dependency import Pipeline
 from penchy.jobs.typecheck import Types
 
@@ -37,29 +37,83 @@ class PipelineElement(object):
 
     A :class:`PipelineElement` must call ``PipelineElement.__init__`` on its
     initialization.
+
+    If ``validate_elements`` is ``False`` only the outermost types of the
+    inputs are checked, not every element. A :class:`~penchy.jobs.job.Job`
+    that is not ``strict`` skips these checks for all elements it runs.
+
+    If ``memoize`` is ``True`` the outputs of up to ``memoize_size`` runs
+    with distinct inputs are kept (the least recently used are dropped first)
+    and reused if the element is run again with equal inputs. Only enable it
+    for elements whose outputs depend on nothing but their inputs.
     """
     DEPENDENCIES = set()
     inputs = Types()
     outputs = Types()
+    validate_elements = True
+    memoize = False
+    memoize_size = 32
 
     def __init__(self):
         self.reset()
 
         self.hooks = []
 
-    def run(self, **kwargs):
+    def run(self, check_elements=None, **kwargs):
         """
         Run element with hooks.
+
+        :param check_elements: check the type of every element of the inputs,
+                               not only the outermost types (defaults to
+                               ``validate_elements``)
+        :type check_elements: bool
         """
-        self.inputs.check_input(kwargs)
+        if check_elements is None:
+            check_elements = self.validate_elements
+        self.inputs.check_input(kwargs, check_elements)
         for hook in self.hooks:
             hook.setup()
 
-        self._run(**kwargs)
+        if self.memoize:
+            self._run_memoized(kwargs)
+        else:
+            self._run(**kwargs)
 
         for hook in self.hooks:
             hook.teardown()
 
+    def _run_memoized(self, kwargs):
+        """
+        Run the element on ``kwargs`` or reuse the outputs of a previous run
+        with equal inputs.
+        """
+        # outputs of previous runs, survives ``reset`` and is created here
+        # because subclasses may not call ``__init__``
+        memo = getattr(self, '_memo', None)
+        if memo is None:
+            memo = self._memo = OrderedDict()
+
+        try:
+            key = _freeze(kwargs)
+            hash(key)
+        except TypeError:
+            # unhashable inputs (e.g. arrays) can't be looked up
+            self._run(**kwargs)
+            return
+
+        # the outputs are copied because later elements may modify them
+        if key in memo:
+            # reinsert to move it to the end, the first is the least recently used
+            outputs = memo.pop(key)
+            memo[key] = outputs
+            self.out = defaultdict(list, _copy_lists(outputs))
+            return
+
+        self._run(**kwargs)
+        if len(memo) >= self.memoize_size:
+            memo.pop(next(iter(memo)))
+        memo[key] = _copy_lists(dict(self.out))
+
     def reset(self):
         """
         Reset state of element.
@@ -93,12 +147,45 @@ class PipelineElement(object):
         return self.__class__.__name__
 
 
+def _freeze(value):
+    """
+    Return a hashable equivalent of ``value`` by converting lists, tuples and
+    dicts (also nested ones).
+
+    Other values are paired with their type, so that e.g. ``1``, ``1.0`` and
+    ``True`` are not equivalent.
+
+    :param value: value to convert
+    :returns: the converted value
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return dict, frozenset((k, _freeze(v)) for k, v in value.items())
+    return type(value), value
+
+
+def _copy_lists(value):
+    """
+    Return a copy of ``value`` that shares no lists or dicts with it (also
+    nested ones).
+
+    :param value: value to copy
+    :returns: the copied value
+    """
+    if isinstance(value, list):
+        return [_copy_lists(v) for v in value]
+    if isinstance(value, dict):
+        return dict((k, _copy_lists(v)) for k, v in value.items())
+    return value
+
+
 class NotRunnable(object):
     """
     This represents a pipeline element that can't be run.
     """
 
-    def run(self):
+    def run(self, *args, **kwargs):
         msg = "{0} can't be run!".format(self.__class__.__name__)
         log.error(msg)
         raise ValueError(msg)
@@ -13,18 +13,24 @@ Outputs are available via the ``out`` attribute.
 """
 from __future__ import division
 
+import io
 import json
 import logging
+import mmap
 import os
 import re
-import shutil
 import math
 import csv
 import operator
-from pprint import pprint
+from contextlib import contextmanager
+from functools import partial
+from itertools import starmap
+from multiprocessing.pool import Pool, ThreadPool
+from pprint import PrettyPrinter
 
 from penchy import __version__
-from penchy.compat import str, path, unicode, try_unicode, write, reduce
+from penchy.compat import (str, path, unicode, try_unicode, write, reduce, native,
+                           copyfile, on_python3)
 from penchy.jobs.dependency import Pipeline
 from penchy.jobs.elements import Filter, SystemFilter
 from penchy.jobs.typecheck import Types, TypeCheckError
@@ -32,6 +38,13 @@ import penchy.util as util
 import penchy.statistics as stats
 from penchy.deploy import Deploy
 
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import as_strided
+except ImportError:  # pragma: no cover
+    # numpy is only required on the server, clients use the pure python paths
+    np = None
+
 
 log = logging.getLogger(__name__)
 
@@ -48,6 +61,8 @@ class Value(object):
     Represents a value in the context of the :class:`~penchy.jobs.filters.Merge`
     filter. It is used to distinguish direct values from filter inputs.
     """
+    __slots__ = ('value',)
+
     def __init__(self, value):
         """
         :param value: the value
@@ -94,6 +109,8 @@ class Tamiflex(Filter):
                     ('line', list, list, str),
                     ('optional', list, list, str))
 
+    _COLUMNS = ('kind', 'name', 'parent_name', 'line', 'optional')
+
     def _run(self, **kwargs):
         files = kwargs['reflection_log']
 
@@ -101,17 +118,14 @@ class Tamiflex(Filter):
             if not os.path.getsize(f):
                 raise WrongInputError("The reflection log is empty")
             with open(f) as fobj:
-                data = {'kind': [], 'name': [], 'parent_name': [],
-                        'line': [], 'optional': []}
-                tamiflex_reader = csv.reader(fobj, delimiter=';')
-                for row in tamiflex_reader:
-                    if len(row) != len(data):
-                        raise WrongInputError("The reflection log is malformed: {0}".format(row))
-                    for value, name in zip(row, data):
-                        data[name].append(value)
+                rows = [line.split(';') for line in fobj.read().splitlines()]
+
+            for row in rows:
+                if len(row) != len(Tamiflex._COLUMNS):
+                    raise WrongInputError("The reflection log is malformed: {0}".format(row))
 
-                for key, val in data.items():
-                    self.out[key].append(val)
+            for name, column in zip(Tamiflex._COLUMNS, zip(*rows)):
+                self.out[name].append(list(column))
 
 
 class HProf(Filter):
@@ -167,10 +181,16 @@ class HProf(Filter):
         self.outputs = outputs
         self.start_marker = start_marker
         self.end_marker = end_marker
-        self.start_re = start_re
-        self.data_re = data_re
+        self.start_re = _bytes_re(start_re)
+        self.data_re = _bytes_re(data_re)
         self.skip = skip
 
+        # the files are scanned as bytes
+        self._start_marker = start_marker.encode('utf8') \
+                             if isinstance(start_marker, unicode) else start_marker
+        self._end_marker = end_marker.encode('utf8') \
+                           if isinstance(end_marker, unicode) else end_marker
+
         # Names of 1 dimensional outputs
         self.names1d = [k for k, d in self.outputs.descriptions.items() if len(d) == 2]
         if len(self.names1d) > 1:
@@ -180,60 +200,135 @@ class HProf(Filter):
         # Names of 2 dimensional outputs
         self.names2d = [k for k, d in self.outputs.descriptions.items() if len(d) == 3]
 
+        # Position in the match groups and conversion function of the extracted values
+        self._casters = tuple((name, self.data_re.groupindex[name] - 1, self._caster(name))
+                              for name in self.names2d)
+
+    def _caster(self, name):
+        """
+        Return the function that converts the parsed bytes of output ``name``
+        to its type.
+
+        :param name: name of the output
+        :type name: str
+        :returns: conversion function
+        :rtype: callable
+        """
+        type_ = self.outputs.descriptions[name][-1]
+        return type_ if issubclass(type_, HProf._PARSED_TYPES) else native
+
     def _run(self, **kwargs):
         files = kwargs['hprof']
 
         for f in files:
-            data = dict((name, []) for name in self.names2d)
+            data = [(name, [], i, cast) for name, i, cast in self._casters]
 
-            with open(f) as fobj:
-                for line in fobj:
-                    if line.startswith(self.start_marker):
-                        # Extract information from the start marker
-                        if self.start_re is not None:
-                            s = self.start_re.search(line)
-                            if s is None:
-                                log.error('Received invalid input:\n{0}'.format(line))
-                                raise WrongInputError('Received invalid input.')
-                            start_value = s.groups()[0]
-                            name = self.names1d[0]
-                            type_ = self.outputs.descriptions[name][-1]
-                            value = type_(start_value) \
-                                    if issubclass(type_, HProf._PARSED_TYPES) \
-                                    else start_value
-                            self.out[name].append(value)
-                        break
-                # We did not break, i.e. no begin marker was found
-                else:
+            with _mapped(f) as buf:
+                start = _find_line(buf, self._start_marker, 0)
+                if start < 0:
                     raise WrongInputError("Marker {0} not found.".format(self.start_marker))
+                pos = _next_line(buf, start)
+
+                # Extract information from the start marker
+                if self.start_re is not None:
+                    s = self.start_re.search(buf, start, pos)
+                    if s is None:
+                        log.error('Received invalid input:\n%s', native(buf[start:pos]))
+                        raise WrongInputError('Received invalid input.')
+                    name = self.names1d[0]
+                    self.out[name].append(self._caster(name)(s.group(1)))
 
                 # Jump over the heading
                 for _ in range(self.skip):
-                    next(fobj)
+                    pos = _next_line(buf, pos)
 
-                for line in fobj:
-                    if line.startswith(self.end_marker):
-                        break
-                    m = self.data_re.match(line)
+                end = _find_line(buf, self._end_marker, pos)
+                if end < 0:
+                    raise WrongInputError("Marker {0} not found.".format(self.end_marker))
+
+                while pos < end:
+                    eol = _next_line(buf, pos)
+                    m = self.data_re.match(buf, pos, eol)
                     if m is None:
-                        log.error('Received invalid input:\n{0}'.format(line))
+                        log.error('Received invalid input:\n%s', native(buf[pos:eol]))
                         raise WrongInputError('Received invalid input.')
-                    result = self.data_re.match(line).groupdict()
+                    groups = m.groups()
 
                     # Cast and save the extracted values
-                    for name in self.names2d:
-                        type_ = self.outputs.descriptions[name][-1]
-                        value = type_(result[name]) \
-                                if issubclass(type_, HProf._PARSED_TYPES) \
-                                else result[name]
-                        data[name].append(value)
-
-                # We did not break, i.e. no end marker was found
-                else:
-                    raise WrongInputError("Marker {0} not found.".format(self.end_marker))
+                    for _, values, i, cast in data:
+                        values.append(cast(groups[i]))
+                    pos = eol
+
+            for name, values, _, _ in data:
+                self.out[name].append(values)
+
+
+def _bytes_re(regex):
+    """
+    Return ``regex`` compiled for matching bytes.
+
+    :param regex: regular expression (or ``None``)
+    :type regex: ``re``
+    :returns: the regular expression matching bytes
+    :rtype: ``re``
+    """
+    if regex is None or not isinstance(regex.pattern, unicode):
+        return regex
+    return re.compile(regex.pattern.encode('utf8'), regex.flags & ~re.UNICODE)
+
+
+@contextmanager
+def _mapped(filename):
+    """
+    Contextmanager that maps the file ``filename`` read-only into memory.
+
+    :param filename: file to map
+    :type filename: str
+    """
+    with open(filename, 'rb') as fobj:
+        # empty files can't be mapped
+        if not os.fstat(fobj.fileno()).st_size:
+            yield b''
+            return
+        buf = mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buf
+        finally:
+            buf.close()
 
-                for key, val in data.items():
-                    self.out[key].append(val)
+
+def _find_line(buf, marker, pos):
+    """
+    Return the position of the first line at or after ``pos`` that starts
+    with ``marker`` or -1 if there is none.
+
+    :param buf: buffer to search in
+    :type buf: bytes or mmap
+    :param marker: start of the line
+    :type marker: bytes
+    :param pos: position of a line start to begin the search at
+    :type pos: int
+    :rtype: int
+    """
+    if buf[pos:pos + len(marker)] == marker:
+        return pos
+    i = buf.find(b'\n' + marker, pos)
+    return i + 1 if i >= 0 else -1
+
+
+def _next_line(buf, pos):
+    """
+    Return the position of the line following the one at ``pos`` (or the
+    length of ``buf`` if there is none).
+
+    :param buf: buffer to search in
+    :type buf: bytes or mmap
+    :param pos: position in the current line
+    :type pos: int
+    :rtype: int
+    """
+    i = buf.find(b'\n', pos)
+    return len(buf) if i < 0 else i + 1
 
 
 class HProfCpuTimes(HProf):
@@ -271,8 +366,8 @@ class HProfCpuTimes(HProf):
                     ('trace', list, list, int),
                     ('method', list, list, str))
 
-    _TOTAL_RE = re.compile('total = (\d+)')
-    _DATA_RE = re.compile("""
+    _TOTAL_RE = re.compile(br'total = (\d+)')
+    _DATA_RE = re.compile(br"""
        \s*(?P<rank>\d+)
        \s+(?P<selftime>\d+\.\d{2})%
        \s+(?P<accum>\d+\.\d{2})%
@@ -325,15 +420,9 @@ class HProfCpuSamples(HProf):
                     ('trace', list, list, int),
                     ('method', list, list, str))
 
-    _TOTAL_RE = re.compile('total = (\d+)')
-    _DATA_RE = re.compile("""
-       \s+(?P<rank>\d+)
-       \s+(?P<selftime>\d+\.\d{2})%
-       \s+(?P<accum>\d+\.\d{2})%
-       \s+(?P<count>\d+)
-       \s+(?P<trace>\d+)
-       \s+(?P<method>[^\s]+)
-       """, re.VERBOSE)
+    # the lines of cpu=samples have the same format as the ones of cpu=times
+    _TOTAL_RE = HProfCpuTimes._TOTAL_RE
+    _DATA_RE = HProfCpuTimes._DATA_RE
 
     def __init__(self):
         super(HProfCpuSamples, self).__init__(outputs=self.outputs,
@@ -385,7 +474,7 @@ class HProfHeapSites(HProf):
                     ('trace', list, list, int),
                     ('class', list, list, str))
 
-    _DATA_RE = re.compile("""
+    _DATA_RE = re.compile(br"""
        \s+(?P<rank>\d+)
        \s+(?P<self>\d+\.\d{2})%
        \s+(?P<accum>\d+\.\d{2})%
@@ -393,6 +482,7 @@ class HProfHeapSites(HProf):
        \s+(?P<live_objs>\d+)
        \s+(?P<alloc_bytes>\d+)
        \s+(?P<alloc_objs>\d+)
+       \s+(?P<trace>\d+)
        \s+(?P<class>[^\s]+)
        """, re.VERBOSE)
 
@@ -419,6 +509,9 @@ class DacapoHarness(Filter):
         composition.flow = [jvm.workload >> dacapo >> "times" >> ...
 
 
+    With ``parallel`` the output files are parsed in a pool of processes,
+    which pays off for many large files only.
+
     Inputs:
 
     - ``stderr``:  List of Paths to stderror output files
@@ -436,42 +529,85 @@ class DacapoHarness(Filter):
                     ('valid', list, bool))
 
     _TIME_RE = re.compile(
-        r"""
+        br"""
+        ^={5}\ DaCapo\ [^\n]*?\           # only lines of the harness
         (?:completed\ warmup\ \d+|        # for iterations
         (?P<success>FAILED|PASSED))       # check if run failed or passed
         \ in\ (?P<time>\d+)\ msec         # time of execution
-        """, re.VERBOSE)
+        """, re.VERBOSE | re.MULTILINE)
+
+    # matched at the start of the output only
+    _VALIDITY_RE = re.compile(br'\n?={5} DaCapo .*?={5}\n={5} DaCapo')
 
-    _VALIDITY_RE = re.compile(r'^\n?={5} DaCapo .*?={5}\n={5} DaCapo')
+    def __init__(self, parallel=False):
+        """
+        :param parallel: parse the output files in a pool of processes
+        :type parallel: bool
+        """
+        super(DacapoHarness, self).__init__()
+        self.parallel = parallel
 
     def _run(self, **kwargs):
         stderror = kwargs['stderr']
 
-        for f in stderror:
-            failures = 0
-            times = []
-            with open(f) as fobj:
-                buf = fobj.read()
+        if self.parallel and len(stderror) > 1:
+            pool = Pool()
+            try:
+                results = pool.map(_parse_dacapo_output, stderror)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = map(_parse_dacapo_output, stderror)
+
+        append_failures = self.out['failures'].append
+        append_times = self.out['times'].append
+        append_valid = self.out['valid'].append
+        for failures, times in results:
+            append_failures(failures)
+            append_times(times)
+            append_valid(failures == 0)
+
+
+def _parse_dacapo_output(filename):
+    """
+    Parse the output of a DaCapo Harness.
+
+    :param filename: path to the stderror output file
+    :type filename: str
+    :returns: failure count and execution time per iteration
+    :rtype: tuple of int and list of int
+    :raises: WrongInputError if the file is no output of a DaCapo Harness
+    """
+    failures = 0
+    times = []
+    append = times.append
 
-            if not self._VALIDITY_RE.search(buf):
-                log.error('Received invalid input:\n{0}'.format(buf))
-                raise WrongInputError('Received invalid input')
+    with _mapped(filename) as buf:
+        if not DacapoHarness._VALIDITY_RE.match(buf):
+            # avoid copying the whole file if it is not logged
+            if log.isEnabledFor(logging.ERROR):
+                log.error('Received invalid input:\n%s', native(buf[:]))
+            raise WrongInputError('Received invalid input')
 
-            for match in DacapoHarness._TIME_RE.finditer(buf):
-                success, time = match.groups()
-                if success is not None and success == 'FAILED':
-                    failures += 1
-                times.append(int(time))
+        for match in DacapoHarness._TIME_RE.finditer(buf):
+            success, time = match.groups()
+            if success == b'FAILED':
+                failures += 1
+            append(int(time))
 
-            self.out['failures'].append(failures)
-            self.out['times'].append(times)
-            self.out['valid'].append(failures == 0)
+    return failures, times
 
 
 class Send(SystemFilter):
     """
     Sends all data fed to it to the server.
 
+    The data of all Send filters of a composition is collected and
+    transmitted at once after the pipeline has run. If several Send filters
+    send values of the same name, only the value of the last one is
+    transmitted (and a warning is logged).
+
     Example::
 
         # This example shows only the relevant parts.
@@ -535,9 +671,12 @@ class Print(Filter):
         super(Print, self).__init__()
 
         self.stream = stream
+        # without a stream, sys.stdout has to be looked up on every run
+        self._printer = None if stream is None else PrettyPrinter(stream=stream)
 
     def _run(self, **kwargs):
-        pprint(kwargs, stream=self.stream)
+        printer = self._printer or PrettyPrinter()
+        printer.pprint(kwargs)
 
 
 class Evaluation(Filter):
@@ -589,7 +728,7 @@ class Evaluation(Filter):
                                       ', '.join(sorted(kwargs))))
                 raise ValueError('Missing input')
 
-        self.out = self.evaluator(**args)
+        self.out.update(self.evaluator(**args))
 
 
 class StatisticRuntimeEvaluation(Evaluation):
@@ -638,14 +777,28 @@ def evaluate_runtimes(times):
     :returns: the metrics described above in their order
     :rtype: dict
     """
-    grouped_by_iteration = [[invocation[i] for invocation in times]
-                            for i in range(len(times[0]))]
-
-    maxs = [max(iteration) for iteration in grouped_by_iteration]
-    mins = [min(iteration) for iteration in grouped_by_iteration]
-    avgs = [stats.average(iteration) for iteration in grouped_by_iteration]
-    pos_deviations = [abs(max_ - avg) / avg for max_, avg in zip(maxs, avgs)]
-    neg_deviations = [abs(min_ - avg) / avg for min_, avg in zip(mins, avgs)]
+    if np is not None and len(times):
+        # the times are milliseconds, no need to guess the type
+        arr = np.asarray(times, dtype=np.int64)
+        maxs = arr.max(axis=0)
+        mins = arr.min(axis=0)
+        avgs = arr.mean(axis=0)
+        # max >= average >= min, no need for the absolute value
+        pos_deviations = ((maxs - avgs) / avgs).tolist()
+        neg_deviations = ((avgs - mins) / avgs).tolist()
+        maxs, mins, avgs = maxs.tolist(), mins.tolist(), avgs.tolist()
+    else:
+        grouped_by_iteration = list(zip(*times))
+
+        maxs = list(map(max, grouped_by_iteration))
+        mins = list(map(min, grouped_by_iteration))
+        n = len(times)
+        avgs = [sum(iteration) / n for iteration in grouped_by_iteration]
+        pos_deviations = []
+        neg_deviations = []
+        for max_, min_, avg in zip(maxs, mins, avgs):
+            pos_deviations.append((max_ - avg) / avg)
+            neg_deviations.append((avg - min_) / avg)
 
     return {'averages': avgs,
             'maximals': maxs,
@@ -697,43 +850,52 @@ class Extract(Filter):
 
         # build the output types and check the given arguments
         names = []
+        # list of (composition or None, name)
+        self._plan = []
         for col in args:
             if isinstance(try_unicode(col), unicode):
-                names.append((col, object))
+                comp, name = None, col
             else:
                 try:
-                    _, name = col
+                    comp, name = col
                 except ValueError:
                     raise ValueError("Extract Filter takes only input names and pairs of system"
                                      "compositions and input names.")
-                names.append((name, object))
+            names.append((name, object))
+            self._plan.append((comp, name))
 
         self.outputs = Types(*names)
         self.columns = args
 
     def _run(self, **kwargs):
         results = kwargs['results']
-        for col in self.columns:
+
+        # map every column to its first occurence and remember the
+        # columns that appear in more than one system composition
+        first = {}
+        duplicates = set()
+        for res in results:
+            for col, values in results[res].items():
+                if col in first:
+                    duplicates.add(col)
+                else:
+                    first[col] = values
+
+        for comp, column in self._plan:
 
             # a system composition is not explicitly given
-            if isinstance(try_unicode(col), unicode):
+            if comp is None:
 
                 # take the column from the first system composition and
                 # warn if it appears in more than one
-                found = False
-                for res in results:
-                    if col in results[res]:
-                        if found:
-                            log.warn("Column '{0}' is contained in more "
-                                     "than one system composition".format(col))
-                        else:
-                            self.out[col] = results[res][col]
-                            found = True
-                if not found:
+                if column not in first:
                     raise WrongInputError('Column is not contained in the resultset')
+                if column in duplicates:
+                    log.warn("Column '{0}' is contained in more "
+                             "than one system composition".format(column))
+                self.out[column] = first[column]
             # a system composition is given explicitly
             else:
-                comp, column = col
                 try:
                     self.out[column] = results[comp][column]
                 except:
@@ -800,54 +962,61 @@ class Merge(Filter):
         self.names = names
         self.outputs = Types(*[(n, object) for n in names])
 
+        # list of (composition or None, ((is column, name or value), ...))
+        self._plan = []
         for row in data:
             if (isinstance(try_unicode(row[0]), unicode) or
                 isinstance(row[0], Value)):
-                n = len(row)
+                comp = None
             else:
-                n = len(row[1:])
+                comp = row[0]
+                row = row[1:]
+            n = len(row)
 
             if n > len(names):
                 raise ValueError("More outputs are used then are defined.")
             if n < len(names):
                 raise ValueError("Not all defined outputs are used.")
 
-            # We can not cover row[0] because importing SystemComposition
+            # We can not cover the composition because importing SystemComposition
             # would lead to cyclic imports
-            for field in row[1:]:
-                if not (isinstance(try_unicode(field), unicode) or
-                        isinstance(field, Value)):
+            fields = []
+            for field in row:
+                if isinstance(try_unicode(field), unicode):
+                    fields.append((True, field))
+                elif isinstance(field, Value):
+                    fields.append((False, field.value))
+                else:
                     raise ValueError("Given value is neither a string nor"
                                      "wrapped by Value.")
+            self._plan.append((comp, tuple(fields)))
 
     def _run(self, **kwargs):
         results = kwargs['results']
-        for row in self.data:
-            # check if a system composition is explicitly given for that row
-            if not isinstance(try_unicode(row[0]), unicode):
-                comp = row[0]
-                row = row[1:]
-            else:
-                comp = None
 
+        # map every column to the first composition that contains it
+        owners = {}
+        if any(comp is None for comp, _ in self._plan):
+            for c in results:
+                for column in results[c]:
+                    owners.setdefault(column, c)
+
+        for comp, fields in self._plan:
             # Everything in this row is taken from the same system composition
-            for name, field in zip(self.names, row):
+            for name, (is_column, field) in zip(self.names, fields):
 
                 # if it is a column, extract it from the right composition
-                if isinstance(try_unicode(field), unicode):
+                if is_column:
                     if comp is None:
-                        for c in results:
-                            if field in results[c]:
-                                comp = c
-                                break
+                        comp = owners.get(field)
                     try:
                         self.out[name].append(results[comp][field])
                     except KeyError:
                         raise WrongInputError('Column "{0}" is not contained in the resultset'.format(field))
 
                 # if it is a ``Value``, just append it
-                elif isinstance(field, Value):
-                    self.out[name].append(field.value)
+                else:
+                    self.out[name].append(field)
 
 
 class ExtractingReceive(Receive, Extract):
@@ -902,6 +1071,16 @@ class Map(Filter):
     the filter has more than one in- and output, it is possible
     to pick one with ``finput`` and ``foutput``.
 
+    If the applied filter has a ``_batched`` method, it is given all elements
+    at once and may return the results for all of them (e.g. by computing them
+    with numpy) or ``None`` to have the filter applied to each element.
+    If the filter has ``memoize`` set, its outputs are reused for equal
+    elements (but not if they are computed at once or in parallel).
+
+    With ``parallel`` the filter is applied in a pool of processes, which
+    pays off for expensive filters only. The filter and the elements have
+    to be picklable.
+
     Example::
 
         # Computes the means of all lists of numbers in a given list.
@@ -909,7 +1088,7 @@ class Map(Filter):
     """
 
     def __init__(self, filter_, input='values', output='values', finput=None,
-                 foutput=None):
+                 foutput=None, parallel=False):
         """
         :param filter_: the filter to be applied
         :type filter_: :class:`~penchy.jobs.elements.Filter`
@@ -921,10 +1100,13 @@ class Map(Filter):
         :type finput: str
         :param foutput: the name of an output of the applied filter
         :type foutput: str
+        :param parallel: apply the filter in a pool of processes
+        :type parallel: bool
         """
         super(Map, self).__init__()
         self.input = input
         self.output = output
+        self.parallel = parallel
         input_desc = filter_.inputs.descriptions
         output_desc = filter_.outputs.descriptions
 
@@ -947,14 +1129,116 @@ class Map(Filter):
         self.filter = filter_
 
     def _run(self, **kwargs):
+        batched = getattr(self.filter, '_batched', None)
+        if batched is not None:
+            results = batched(kwargs[self.input])
+            if results is not None:
+                self.out[self.output].extend(results)
+                return
+
+        if self.parallel:
+            pool = Pool()
+            try:
+                results = pool.map(_FilterApplication(self.filter, self.finput,
+                                                      self.foutput),
+                                   kwargs[self.input])
+            finally:
+                pool.close()
+                pool.join()
+            self.out[self.output].extend(results)
+            return
+
+        filter_, finput, foutput = self.filter, self.finput, self.foutput
+        memoize = filter_.memoize
+        append = self.out[self.output].append
         for v in kwargs[self.input]:
-            param = {self.finput: v}
-            self.filter._run(**param)
-            self.out[self.output].append(self.filter.out[self.foutput])
-            self.filter.reset()
+            if memoize:
+                filter_._run_memoized({finput: v})
+            else:
+                filter_._run(**{finput: v})
+            # reset replaces the output of the filter, it can't be bound
+            append(filter_.out[foutput])
+            filter_.reset()
+
+
+class _FilterApplication(object):
+    """
+    Picklable function that applies a filter to a single value (used by
+    :class:`~penchy.jobs.filters.Map` to apply it in other processes).
+    """
+    def __init__(self, filter_, finput, foutput):
+        self.filter = filter_
+        self.finput = finput
+        self.foutput = foutput
+
+    def __call__(self, value):
+        self.filter._run(**{self.finput: value})
+        result = self.filter.out[self.foutput]
+        self.filter.reset()
+        return result
+
+
+class UploadBatch(Filter):
+    """
+    Uploads several files to a remote machine over a single connection.
+
+    Inputs:
+
+    - ``filenames``: The filenames of the files to upload
+    - ``remote_paths``: The paths to upload the files to (in the same order)
+    """
+    inputs = Types(('filenames', list, path),
+                   ('remote_paths', list, path))
+
+    def __init__(self, method, *args, **kwargs):
+        """
+        :param method: method to use
+        :type method: descendant of :class:`~penchy.deploy.Deploy`
+
+        Additionally, you can pass any arguments you'd normally
+        pass to your implementation of :class:`~penchy.deploy.Deploy`
+
+        A simple way to use this might be::
+
+            upload = filters.UploadBatch(SFTPDeploy, '0x0b.de', 'me', 'pass')
+
+            job = Job(composition=comp1)
+                server_flow=[
+                    ... >> ['filenames', 'remote_paths'] >> upload
+
+        Compared to several :class:`~penchy.jobs.filters.Upload` filters, the
+        connection is only established once for all files.
+        """
+        super(UploadBatch, self).__init__()
+        if not issubclass(method, Deploy):
+            raise ValueError('deploy must be a descendant of ``Deploy``')
+
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+    def _run(self, **kwargs):
+        filenames = kwargs['filenames']
+        remote_paths = kwargs['remote_paths']
+        if len(filenames) != len(remote_paths):
+            raise WrongInputError('Got {0} files but {1} remote paths'
+                                  .format(len(filenames), len(remote_paths)))
+        self._upload(zip(filenames, remote_paths))
+
+    def _upload(self, files):
+        """
+        Upload all ``files`` using one connection.
+
+        :param files: pairs of local and remote paths
+        :type files: iterable of (str, str)
+        """
+        method = self.method(*self.args, **self.kwargs)
+        with method.connection_required():
+            for local, remote in files:
+                method.put(local, remote)
 
 
-class Upload(Filter):  # pragma: no cover
+class Upload(UploadBatch):
     """
     Uploads a plot to a remote machine.
 
@@ -990,19 +1274,11 @@ class Upload(Filter):  # pragma: no cover
 
         where ``0x0b`` is the id of this server as defined in :file:`settings.xml`.
         """
-        super(Upload, self).__init__()
-        if not issubclass(method, Deploy):
-            raise ValueError('deploy must be a descendant of ``Deploy``')
-
-        self.method = method
+        super(Upload, self).__init__(method, *args, **kwargs)
         self.remote_path = remote_path
-        self.args = args
-        self.kwargs = kwargs
 
     def _run(self, **kwargs):
-        method = self.method(*self.args, **self.kwargs)
-        with method.connection_required():
-            method.put(kwargs['filename'], self.remote_path)
+        self._upload([(kwargs['filename'], self.remote_path)])
 
 
 class Dump(SystemFilter):
@@ -1039,6 +1315,8 @@ class Dump(SystemFilter):
         super(Dump, self).__init__()
         self.include = include_complete_job
         self.indent = indent
+        # maps what the information of a composition is gathered from to it
+        self._information = {}
 
     def _run(self, **kwargs):
         # collect and include system information
@@ -1053,21 +1331,46 @@ class Dump(SystemFilter):
             'penchy': __version__
         }
         if env['current_composition'] is not None:
-            comp = env['current_composition']
-            system['composition'] = comp.__str__(),
-            system['jvm'] = comp.jvm.information()
-            classes = set(e.__class__ for e in comp.elements)
-            system['dependencies'] = dict((c.__name__, [dep.__str__() for dep
-                                                        in c.DEPENDENCIES])
-                                           for c in classes
-                                          if c.DEPENDENCIES)
+            system.update(self._composition_information(env['current_composition']))
         dump = {
             'system': system,
             'data': kwargs
         }
-        s = json.dumps(dump, indent=self.indent)
+        # a dump without indentation is not meant to be read by humans,
+        # leave out the whitespace after the separators
+        separators = (',', ':') if self.indent is None else None
+        s = json.dumps(dump, indent=self.indent, separators=separators)
         self.out['dump'] = s
 
+    def _composition_information(self, comp):
+        """
+        Return the information about ``comp`` (its name, JVM and dependencies).
+
+        The information is gathered only once per configuration of the
+        composition because it involves executing the JVM.
+
+        :param comp: the composition
+        :type comp: :class:`~penchy.jobs.job.SystemComposition`
+        :returns: information about the composition
+        :rtype: dict
+        """
+        classes = frozenset(e.__class__ for e in comp.elements)
+        jvm = comp.jvm
+        key = comp.__str__(), jvm.basepath, tuple(jvm.cmdline), classes
+        if key in self._information:
+            return self._information[key]
+
+        information = {
+            'composition': comp.__str__(),
+            'jvm': comp.jvm.information(),
+            'dependencies': dict((c.__name__, [dep.__str__() for dep
+                                               in c.DEPENDENCIES])
+                                 for c in classes
+                                 if c.DEPENDENCIES)
+        }
+        self._information[key] = information
+        return information
+
 
 class Save(SystemFilter):
     """
@@ -1091,12 +1394,10 @@ class Save(SystemFilter):
         self.target_path = target_path
 
     def _run(self, **kwargs):
-        if not os.path.isabs(self.target_path) \
-           and kwargs[':environment:']['current_composition'] is not None:
-            node_setting = kwargs[':environment:']['current_composition'].node_setting
-            self.target_path = os.path.join(node_setting.path, self.target_path)
-        log.debug('Save to "{0}"'.format(os.path.abspath(self.target_path)))
-        with open(self.target_path, 'wb') as f:
+        target_path = _resolve_target_path(self.target_path, kwargs[':environment:'])
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Save to "%s"', os.path.abspath(target_path))
+        with open(target_path, 'wb') as f:
             write(f, kwargs['data'])
 
 
@@ -1122,16 +1423,34 @@ class BackupFile(SystemFilter):
         self.target_path = target_path
 
     def _run(self, **kwargs):
-        if not os.path.isabs(self.target_path) \
-           and kwargs[':environment:']['current_composition'] is not None:
-            node_setting = kwargs[':environment:']['current_composition'].node_setting
-            self.target_path = os.path.join(node_setting.path, self.target_path)
+        target_path = _resolve_target_path(self.target_path, kwargs[':environment:'])
         path = kwargs['filename']
         if not os.path.exists(path):
             raise WrongInputError('file {0} does not exist'.format(path))
-        log.debug('Backup "{0}" to "{1}"'.format(os.path.abspath(path),
-                                                 os.path.abspath(self.target_path)))
-        shutil.copyfile(path, self.target_path)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Backup "%s" to "%s"', os.path.abspath(path),
+                      os.path.abspath(target_path))
+        copyfile(path, target_path)
+
+
+def _resolve_target_path(target_path, environment):
+    """
+    Return ``target_path`` relative to the
+    :class:`~penchy.jobs.job.NodeSetting`.path of the current composition if
+    it is not absolute and a composition is running.
+
+    :param target_path: path to resolve
+    :type target_path: str
+    :param environment: see :meth:`Job._build_environment`
+    :type environment: dict
+    :returns: resolved path
+    :rtype: str
+    """
+    if not os.path.isabs(target_path) \
+       and environment['current_composition'] is not None:
+        node_setting = environment['current_composition'].node_setting
+        return os.path.join(node_setting.path, target_path)
+    return target_path
 
 
 class Read(Filter):
@@ -1149,6 +1468,9 @@ class Read(Filter):
     inputs = Types(('paths', list, path))
     outputs = Types(('data', list, str))
 
+    # maximal number of files read in parallel
+    MAX_THREADS = 8
+
     def __init__(self, encoding=None):
         """
         :param encoding: decode files with this encoding (will return unicode
@@ -1162,16 +1484,34 @@ class Read(Filter):
 
     def _run(self, **kwargs):
         paths = kwargs['paths']
-        data = []
-        for p in paths:
-            log.debug('Reading "{0}"'.format(os.path.abspath(p)))
-            with open(p, 'rb') as f:
-                if self.encoding:
-                    data.append(f.read().decode(self.encoding))
-                else:
-                    data.append(f.read())
+        if len(paths) > 1:
+            # the reads wait for I/O without holding the GIL
+            pool = ThreadPool(min(Read.MAX_THREADS, len(paths)))
+            try:
+                data = pool.map(self._read, paths)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            data = [self._read(p) for p in paths]
         self.out['data'] = data
 
+    def _read(self, p):
+        """
+        Return the contents of the file ``p``.
+
+        :param p: path to the file
+        :type p: str
+        :rtype: str or unicode
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Reading "%s"', os.path.abspath(p))
+        # unbuffered: the whole file is read at once, sized by fstat
+        with open(p, 'rb', 0) as f:
+            if self.encoding:
+                return f.read().decode(self.encoding)
+            return f.read()
+
 
 class Unpack(Filter):
     """
@@ -1206,12 +1546,34 @@ class Unpack(Filter):
 
     def _run(self, **kwargs):
         singleton = kwargs[self.input]
-        if len(singleton) > 1:
+        n = len(singleton)
+        if n > 1:
             raise WrongInputError('The list has more than one element.')
-        if len(singleton) < 1:
+        if n < 1:
             raise WrongInputError('The list is empty.')
-        value = singleton.pop()
-        self.out[self.output] = value
+        # the list may be an input of other elements, don't modify it
+        self.out[self.output] = singleton[0]
+
+
+def _matrix(xss, dtype=None):
+    """
+    Return the lists ``xss`` as rows of a two dimensional numeric array or
+    ``None`` if numpy is not available or the lists are empty or ragged.
+
+    :param xss: lists of numbers
+    :type xss: list of lists
+    :param dtype: type of the array (guessed if ``None``)
+    :rtype: :class:`numpy.ndarray`
+    """
+    if np is None or not len(xss):
+        return None
+    try:
+        arr = np.asarray(xss, dtype=dtype)
+    except ValueError:
+        return None
+    if arr.ndim != 2 or not arr.shape[1] or arr.dtype.kind not in 'iuf':
+        return None
+    return arr
 
 
 class Mean(Filter):
@@ -1230,7 +1592,19 @@ class Mean(Filter):
     outputs = Types(('mean', float))
 
     def _run(self, **kwargs):
-        self.out['mean'] = stats.average(kwargs['values'])
+        values = kwargs['values']
+        if np is not None and len(values):
+            self.out['mean'] = np.asarray(values, dtype=float).mean().item()
+        else:
+            self.out['mean'] = stats.average(values)
+
+    def _batched(self, xss):
+        """
+        Return the means of all lists in ``xss`` or ``None`` if they can not
+        be computed at once (see :class:`~penchy.jobs.filters.Map`).
+        """
+        arr = _matrix(xss, float)
+        return None if arr is None else arr.mean(axis=1).tolist()
 
 
 class StandardDeviation(Filter):
@@ -1265,9 +1639,22 @@ class StandardDeviation(Filter):
 
     def _run(self, **kwargs):
         vs = kwargs['values']
-        std = stats.standard_deviation(vs, self.ddof)
+        if np is not None and len(vs) > self.ddof:
+            std = np.asarray(vs, dtype=float).std(ddof=self.ddof).item()
+        else:
+            std = stats.standard_deviation(vs, self.ddof)
         self.out['standard_deviation'] = std
 
+    def _batched(self, xss):
+        """
+        Return the standard deviations of all lists in ``xss`` or ``None`` if
+        they can not be computed at once (see :class:`~penchy.jobs.filters.Map`).
+        """
+        arr = _matrix(xss, float)
+        if arr is None or arr.shape[1] <= self.ddof:
+            return None
+        return arr.std(axis=1, ddof=self.ddof).tolist()
+
 
 class Sum(Filter):
     """
@@ -1299,7 +1686,23 @@ class Sum(Filter):
         self.outputs = Types((output, (int, float)))
 
     def _run(self, **kwargs):
-        self.out[self.output] = sum(kwargs[self.input])
+        values = kwargs[self.input]
+        arr = np.asarray(values) if np is not None and len(values) else None
+        # ints are summed exactly, numpy would wrap them around in int64
+        if arr is not None and arr.dtype.kind == 'f':
+            self.out[self.output] = arr.sum().item()
+        else:
+            self.out[self.output] = sum(values)
+
+    def _batched(self, xss):
+        """
+        Return the sums of all lists in ``xss`` or ``None`` if they can not
+        be computed at once (see :class:`~penchy.jobs.filters.Map`).
+        """
+        arr = _matrix(xss)
+        if arr is None or arr.dtype.kind != 'f':
+            return None
+        return arr.sum(axis=1).tolist()
 
 
 class Enumerate(Filter):
@@ -1332,9 +1735,10 @@ class Enumerate(Filter):
         self.step = step
 
     def _run(self, **kwargs):
-        self.out['values'] = kwargs['values']
+        values = kwargs['values']
+        self.out['values'] = values
         self.out['numbers'] = list(range(self.start,
-                                         self.start + len(kwargs['values'] * self.step),
+                                         self.start + len(values) * self.step,
                                          self.step))
 
 
@@ -1365,11 +1769,61 @@ class Decorate(Filter):
         super(Decorate, self).__init__()
 
         self.inputs = Types(*[(i, list, (int, float)) for i in inputs])
+        # the position of an input in the interpolation string is its
+        # position in ``inputs``
+        self.input_names = list(inputs)
         self.string = string
 
     def _run(self, **kwargs):
-        values = zip(*[kwargs[name] for name in self.inputs.names])
-        self.out['values'] = [self.string.format(*v) for v in values]
+        values = zip(*[kwargs[name] for name in self.input_names])
+        self.out['values'] = list(starmap(self.string.format, values))
+
+
+@util.memoized
+def _norm_ppf(q):
+    """
+    Return the quantile ``q`` of the standard normal distribution.
+
+    :param q: lower tail probability
+    :type q: float
+    :rtype: float
+    """
+    # scipy is only available on the server
+    from scipy.stats import norm
+    return norm.ppf(q)
+
+
+@util.memoized
+def _t_ppf(q, df):
+    """
+    Return the quantile ``q`` of Student's t-distribution with ``df`` degrees
+    of freedom.
+
+    :param q: lower tail probability
+    :type q: float
+    :param df: degrees of freedom
+    :type df: int or float
+    :rtype: float
+    """
+    from scipy.stats import t
+    return t.ppf(q, df)
+
+
+def _summary(xs):
+    """
+    Return the number of samples, their average and their sample standard
+    deviation.
+
+    :param xs: sample values
+    :type xs: list of numbers
+    :returns: number, average and standard deviation of ``xs``
+    :rtype: tuple (int, float, float)
+    """
+    n = len(xs)
+    if np is not None and n > 1:
+        arr = np.asarray(xs, dtype=float)
+        return n, arr.mean().item(), arr.std(ddof=1).item()
+    return n, stats.average(xs), stats.standard_deviation(xs, ddof=1)
 
 
 class ConfidenceIntervalMean(Filter):
@@ -1394,25 +1848,18 @@ class ConfidenceIntervalMean(Filter):
         self.sig_level = significance_level
 
     def _run(self, **kwargs):
-        # Gaussian distribution
-        from scipy.stats import norm
-        # Students t-distribution
-        from scipy.stats import t
-
         xs = kwargs['values']
 
         # These computations are common to both of the following two cases
-        n = len(xs)
-        avg = stats.average(xs)
-        s = stats.standard_deviation(xs, ddof=1)
+        n, avg, s = _summary(xs)
 
         # If the number of samples is large
         if n > 29:
-            d = norm.ppf(1 - self.sig_level / 2)
+            d = _norm_ppf(1 - self.sig_level / 2)
 
         # If the number of samples is small
         else:
-            d = t.ppf(1 - self.sig_level / 2, n - 1)
+            d = _t_ppf(1 - self.sig_level / 2, n - 1)
 
         c1 = avg - d * s / math.sqrt(n)
         c2 = avg + d * s / math.sqrt(n)
@@ -1449,33 +1896,25 @@ class CI2Alternatives(Filter):
         self.sig_level = significance_level
 
     def _run(self, **kwargs):
-        # Gaussian distribution
-        from scipy.stats import norm
-        # Students t-distribution
-        from scipy.stats import t
-
         xs = kwargs['xs']
         ys = kwargs['ys']
 
         # These computations are common to both of the following two cases
-        n1, n2 = len(xs), len(ys)
-        s1 = stats.standard_deviation(xs, ddof=1)
-        s2 = stats.standard_deviation(ys, ddof=1)
+        n1, avgx, s1 = _summary(xs)
+        n2, avgy, s2 = _summary(ys)
         sx = math.sqrt((s1 ** 2) / n1 + (s2 ** 2) / n2)
-        avgx = stats.average(xs)
-        avgy = stats.average(ys)
         avg = avgx - avgy
 
         # If the number of samples is large in both samples
         if n1 > 29 and n2 > 29:
-            d = norm.ppf(1 - self.sig_level / 2)
+            d = _norm_ppf(1 - self.sig_level / 2)
 
         # If the number of samples is small in at least one sample
         else:
             numerator = (s1 ** 2 / n1 + s2 ** 2 / n2) ** 2
             denumerator = (s1 ** 2 / n1) ** 2 / (n1 - 1) + (s2 ** 2 / n2) ** 2 / (n2 - 1)
             ndf = numerator / denumerator
-            d = t.ppf(1 - self.sig_level / 2, round(ndf, 0))
+            d = _t_ppf(1 - self.sig_level / 2, round(ndf, 0))
 
         c1 = avg - d * sx
         c2 = avg + d * sx
@@ -1515,11 +1954,46 @@ class SteadyState(Filter):
         xss = kwargs['values']
 
         for xs in xss:
+            if np is not None:
+                i = self._steady_state_numpy(xs)
+                if i is not None:
+                    self.out['values'].append(xs[i:self.k + i])
+                continue
+
             for i in range(0, len(xs) - self.k):
                 if stats.coefficient_of_variation(xs[i:self.k + i]) < self.threshold:
                     self.out['values'].append(xs[i:self.k + i])
                     break
 
+    def _steady_state_numpy(self, xs):
+        """
+        Return the first iteration of ``xs`` where steady-state performance is
+        reached or ``None``.
+
+        :param xs: measurements of one invocation
+        :type xs: list of numbers
+        :rtype: int
+        """
+        arr = np.asarray(xs, dtype=float)
+        n = len(arr) - self.k
+        if n <= 0:
+            return None
+        # fail on degenerate windows like the pure python path
+        if self.k < 2:
+            raise ZeroDivisionError('The standard deviation of less than two '
+                                    'measurements is undefined.')
+
+        # view of all windows of k measurements, evaluated at once
+        windows = as_strided(arr, shape=(n, self.k), strides=(arr.strides[0],) * 2)
+        means = windows.mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cvs = windows.std(axis=1, ddof=1) / means
+        steady = np.flatnonzero(cvs < self.threshold)
+        first = int(steady[0]) if len(steady) else None
+        if not means[:first].all():
+            raise ZeroDivisionError('The mean of a window of measurements is zero.')
+        return first
+
 
 class Sort(Filter):
     """
@@ -1557,11 +2031,11 @@ class Sort(Filter):
         values = zip(*kwargs.values())
 
         # Get the positions of the columns in ``sort_by``
-        columns = [i for i, x in enumerate(names) if x in self.sort_by]
+        columns = [names.index(x) for x in self.sort_by if x in names]
 
-        # Sort the table
-        for column in reversed(columns):
-            values = sorted(values, key=operator.itemgetter(column),
+        # Sort the table by all columns at once
+        if columns:
+            values = sorted(values, key=operator.itemgetter(*columns),
                             reverse=self.reverse)
 
         for name, value in zip(names, zip(*values)):
@@ -1594,10 +2068,16 @@ class Accumulate(Filter):
     def _run(self, **kwargs):
         numbers = kwargs[self.name]
 
-        accum = 0
-        for n in numbers:
-            accum += n
-            self.out['accum'].append(accum)
+        if np is not None:
+            self.out['accum'] = np.cumsum(np.asarray(numbers, dtype=float)).tolist()
+        else:
+            # the length is known, fill a preallocated list
+            accums = [0] * len(numbers)
+            accum = 0
+            for i, n in enumerate(numbers):
+                accum += n
+                accums[i] = accum
+            self.out['accum'] = accums
 
 
 class Normalize(Filter):
@@ -1630,10 +2110,21 @@ class Normalize(Filter):
         numbers = kwargs['values']
         n = kwargs['norm']
 
-        for number in numbers:
-            self.out['values'].append(number / n)
+        if np is not None:
+            if not n and len(numbers):
+                # numpy would return infs, fail like the division below
+                raise ZeroDivisionError('division by zero')
+            normalized = np.asarray(numbers, dtype=float) / n
+            # pairwise summation, the error grows only logarithmically
+            total = normalized.sum().item()
+            self.out['values'] = normalized.tolist()
+        else:
+            self.out['values'] = [number / n for number in numbers]
+            # correctly rounded, no drift on long lists
+            total = math.fsum(self.out['values'])
 
-        if abs(1.0 - sum(self.out['values'])) < self.epsilon:
+        # nothing to warn about for no numbers
+        if len(numbers) and abs(1.0 - total) > self.epsilon:
             log.warn("The normalized sum differs more than {0} from 1.0".format(self.epsilon))
 
 
@@ -1661,7 +2152,21 @@ class Zip(Filter):
     outputs = Types(('values', list, list, object))
 
     def _run(self, **kwargs):
-        self.out['values'] = [list(l) for l in zip(*kwargs['values'])]
+        values = kwargs['values']
+        type_ = type(values[0][0]) if values and values[0] else None
+        kind = {int: 'i', float: 'f'}.get(type_)
+        # transpose rectangular numeric tables in one go, but only if numpy
+        # returns every element with its type (e.g. no ints as floats)
+        if np is not None and kind is not None and \
+           all(type(v) is type_ for row in values for v in row):
+            try:
+                arr = np.asarray(values)
+            except (ValueError, TypeError, OverflowError):
+                arr = None
+            if arr is not None and arr.ndim == 2 and arr.dtype.kind == kind:
+                self.out['values'] = arr.T.tolist()
+                return
+        self.out['values'] = list(map(list, zip(*values)))
 
 
 class Slice(Filter):
@@ -1762,7 +2267,24 @@ class Reduce(Slice):
         self.initializer = initializer
 
     def _run(self, **kwargs):
-        self.out['values'] = reduce(self.function, kwargs['values'], self.initializer)
+        values = kwargs['values']
+        if self.initializer is None:
+            if not len(values):
+                # there is nothing to reduce
+                self.out['values'] = None
+                return
+            start = values[0]
+        else:
+            start = self.initializer
+
+        if self.function is operator.add and isinstance(start, (int, float)):
+            # adds the numbers without calling back for every element
+            result = sum(values, 0 if self.initializer is None else self.initializer)
+        elif self.initializer is None:
+            result = reduce(self.function, values)
+        else:
+            result = reduce(self.function, values, self.initializer)
+        self.out['values'] = result
 
 
 class Composer(object):
@@ -1800,9 +2322,12 @@ class Composer(object):
         :type elements: see :meth:`Composer._build_part`
         """
         self.parts = elements
+        # how to build each part is decided once, the filters are
+        # instantiated anew for every pipeline
+        self._factories = [self._factory(part) for part in elements]
 
     def __rshift__(self, other):
-        parts = [self._build_part(part) for part in self.parts]
+        parts = [factory() for factory in self._factories]
         first, rest = parts[0], parts[1:]
         pipeline = Pipeline(first)
         for part in rest:
@@ -1812,7 +2337,16 @@ class Composer(object):
     @staticmethod
     def _build_part(part):
         """
-        Build the passed part depending on its type.
+        Build the passed part depending on its type (see
+        :meth:`Composer._factory`).
+        """
+        return Composer._factory(part)()
+
+    @staticmethod
+    def _factory(part):
+        """
+        Return a function without arguments that builds the passed part
+        depending on its type.
 
         ``part`` can be
 
@@ -1832,12 +2366,59 @@ class Composer(object):
                 args = args[:-1]
             else:
                 kwargs = {}
-            element = filter_(*args, **kwargs)
+            return partial(filter_, *args, **kwargs)
         elif isinstance(part, type) and issubclass(part, Filter):
-            element = part()
+            return part
         else:
-            element = part
-        return element
+            return lambda: part
+
+
+def _identity(x):
+    return x
+
+
+def _level_sizes(values):
+    """
+    Return the length of the longest list per nesting-level of ``values``.
+
+    :param values: the balanced nested list
+    :type values: list
+    :rtype: list of int
+    :raises: ValueError if the lists are not balanced
+    """
+    sizes = []
+    level = [values]
+    while level:
+        nested = [isinstance(l, list) for l in level]
+        if not all(nested):
+            if any(nested):
+                raise ValueError("Lists are not balanced.")
+            break
+        sizes.append(max(map(len, level)))
+        level = [v for l in level for v in l]
+    return sizes
+
+
+_NATIVE_STRING = type('')
+_NEEDS_QUOTING = re.compile('[\t\r\n"]')
+
+
+def _plain_cell(x):
+    """
+    Format ``x`` like :mod:`csv` does for cells that do not need quoting.
+
+    :param x: the cell
+    :returns: the formatted cell
+    :rtype: str (native)
+    :raises: ValueError if the cell is neither a number nor a plain string
+    """
+    t = type(x)
+    if t is _NATIVE_STRING:
+        if _NEEDS_QUOTING.search(x) is None:
+            return x
+    elif t is int or t is float or t is bool:
+        return repr(x)
+    raise ValueError("{0!r} is not a plain cell".format(x))
 
 
 class Export(Filter):
@@ -1893,7 +2474,11 @@ class Export(Filter):
 
     inputs = Types(('values', list, object))
 
-    def __init__(self, filename, heading, functions=None, valuefunction=None):
+    #: size of the write buffer of the exported file
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, filename, heading, functions=None, valuefunction=None,
+                 fast_path=True):
         """
         :param filename: the filename in which the export is saved
         :type filename: str
@@ -1904,38 +2489,102 @@ class Export(Filter):
         :type functions: list functions
         :param valuefunction: function that can modify the actual value
         :type valuefunction: function
+        :param fast_path: write rows of numbers and plain strings without
+                          :mod:`csv`
+        :type fast_path: bool
         """
         self.filename = filename
         self.heading = heading
         self.functions = functions
         self.valuefunction = valuefunction
+        self.fast_path = fast_path
 
     def _run(self, **kwargs):
         values = kwargs['values']
-        depth = util.depth(values)
+        sizes = _level_sizes(values)
+        depth = len(sizes)
+
+        # don't modify the functions, the filter may run again
+        functions = list(self.functions or ())
+        if len(functions) > depth:
+            log.warn("You have specified more functions than "
+                     "nested-levels in the input list are available.")
+        functions.extend([_identity] * (depth - len(functions)))
+
+        # csv wants binary files on python2 and text files on python3,
+        # a large buffer coalesces the rows into few writes
+        if on_python3:  # pragma: no cover
+            f = io.open(self.filename, 'w', self.BUFFER_SIZE, newline='')
+        else:
+            f = io.open(self.filename, 'wb', self.BUFFER_SIZE)
+        with f:
+            writer = csv.writer(f, delimiter='\t')
+            writer.writerow(self.heading)
+            rows = self._rows(values, functions, sizes)
+            if self.fast_path and isinstance(values, list):
+                self._write(f, writer, rows)
+            else:
+                writer.writerows(rows)
 
-        if self.functions:
-            if depth < len(self.functions):
-                log.warn("You have specified more functions than "
-                         "nested-levels in the input list are available.")
+    def _write(self, f, writer, rows):
+        """
+        Write the ``rows`` to the file ``f``.
 
-            diff = abs(depth - len(self.functions))
-            self.functions.extend([lambda x: x] * diff)
-        else:
-            self.functions = [lambda x: x] * (depth + 1)
+        Rows that consist of numbers and strings that do not need quoting
+        are written directly, all others with the csv ``writer``.
 
-        if not self.valuefunction:
-            self.valuefunction = lambda x: x
+        :param f: the file ``writer`` writes to
+        :type f: file
+        :param writer: the csv writer
+        :param rows: the rows to write
+        :type rows: iterable of lists
+        """
+        write = f.write
+        writerow = writer.writerow
+        delimiter = writer.dialect.delimiter
+        terminator = writer.dialect.lineterminator
+        for row in rows:
+            try:
+                line = delimiter.join(map(_plain_cell, row))
+            except ValueError:
+                writerow(row)
+            else:
+                write(line + terminator)
 
-        with open(self.filename, 'wb') as f:
-            writer = csv.writer(f, delimiter='\t')
-            writer.writerow(self.heading)
-            self._export(writer, values, self.functions, [])
+    def _rows(self, values, functions, sizes):
+        """
+        Generate the rows of the export.
 
-    def _export(self, writer, values, functions, accum):
-        if isinstance(values, list):
-            for i, v in enumerate(values):
-                self._export(writer, v, functions[1:],
-                        accum + [functions[0](i)])
-        else:
-            writer.writerow(accum + [self.valuefunction(values)])
+        :param values: the (nested) list of values
+        :type values: list
+        :param functions: functions that map the positions to descriptions
+        :type functions: list of functions
+        :param sizes: the length of the longest list per nesting-level
+        :type sizes: list of int
+        """
+        valuefunction = self.valuefunction or _identity
+        if not isinstance(values, list):
+            yield [valuefunction(values)]
+            return
+
+        # the names of all positions per nesting-level, so that the
+        # functions are called once per position instead of once per row
+        tables = [[function(i) for i in range(size)]
+                  for function, size in zip(functions, sizes)]
+
+        # depth first traversal with an explicit stack of the positions in
+        # the nested lists, ``accum`` holds the names of the current path
+        accum = []
+        stack = [enumerate(values)]
+        while stack:
+            names = tables[len(stack) - 1]
+            for i, v in stack[-1]:
+                if isinstance(v, list):
+                    accum.append(names[i])
+                    stack.append(enumerate(v))
+                    break
+                yield accum + [names[i], valuefunction(v)]
+            else:
+                stack.pop()
+                if stack:
+                    accum.pop()
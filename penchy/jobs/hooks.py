@@ -11,6 +11,7 @@ This module provides Hook elements that wrap the execution of
 """
 from subprocess import Popen
 import shlex
+import time
 
 from penchy.util import default
 
@@ -69,24 +70,34 @@ class ExecuteHook(BaseHook):
     """
     Hook that executes an arbitary command in the setup phase.
     If the command is still running during teardown, it will
-    be terminated.
+    be terminated (and killed if it does not exit within ``timeout``
+    seconds).
     """
-    def __init__(self, args):
+    def __init__(self, args, timeout=5):
         """
         :param args: sequence of program arguments,
                      see :class:`subprocess.Popen` for details
         :type args: string or sequence
+        :param timeout: seconds to wait for the termination of the command
+                        before it is killed
+        :type timeout: int or float
         """
         super(ExecuteHook, self).__init__()
         self.args = args
+        self.timeout = timeout
         self.proc = None
+        self._argv = shlex.split(args) if isinstance(args, str) else list(args)
 
     def setup(self):
-        self.proc = Popen(shlex.split(self.args) if
-                isinstance(self.args, str) else self.args)
+        self.proc = Popen(self._argv)
 
     def teardown(self):
-        self.proc.poll()
-        if self.proc.returncode is None:
+        if self.proc.poll() is None:
             self.proc.terminate()
-            self.proc.wait()
+            # Popen.wait has no timeout on python2
+            deadline = time.time() + self.timeout
+            while self.proc.poll() is None and time.time() < deadline:
+                time.sleep(0.01)
+            if self.proc.returncode is None:
+                self.proc.kill()
+                self.proc.wait()
@@ -11,13 +11,10 @@ import logging
 import os
 import subprocess
 from collections import defaultdict
-from functools import partial
-from hashlib import sha1
-from itertools import groupby, chain
-from operator import attrgetter
+from itertools import chain
 from tempfile import NamedTemporaryFile
 
-from penchy.compat import update_hasher, write
+from penchy.compat import sha1, write
 from penchy.jobs.dependency import build_keys, edgesort
 from penchy.jobs.elements import PipelineElement, SystemFilter
 from penchy.jobs.filters import Receive, Send, WrongInputError
@@ -25,17 +22,34 @@ from penchy.jobs.plots import Plot
 from penchy.jobs.hooks import Hook
 from penchy.jobs.typecheck import TypeCheckError
 from penchy.maven import get_classpath, setup_dependencies
-from penchy.util import tempdir, default
+from penchy.util import tempdir, default, unify
 
 
 log = logging.getLogger(__name__)
 
 
+def _receive_nothing():
+    """
+    Stand-in for an unset receive of :class:`Job`.
+    """
+    return {}
+
+
+def _send_nothing(data):
+    """
+    Stand-in for an unset send of :class:`Job`.
+    """
+
+
 class NodeSetting(object):
     """
     Represents a configuration of a node.
     """
 
+    __slots__ = ('host', 'ssh_port', 'username', 'path', 'basepath',
+                 'description', 'password', 'keyfile', '_timeout_factor',
+                 '_hash')
+
     def __init__(self, host, ssh_port, username, path,
                  basepath, description="", password=None,
                  keyfile=None, timeout_factor=1):
@@ -75,6 +89,8 @@ class NodeSetting(object):
         self.password = password
         self.keyfile = keyfile
         self._timeout_factor = timeout_factor
+        # identifier and its sha1 hexdigest
+        self._hash = None
 
     @property
     def identifier(self):
@@ -116,9 +132,10 @@ class NodeSetting(object):
         :returns: sha1 hexdigest of instance
         :rtype: string
         """
-        hasher = sha1()
-        update_hasher(hasher, self.identifier)
-        return hasher.hexdigest()
+        identifier = self.identifier
+        if self._hash is None or self._hash[0] != identifier:
+            self._hash = identifier, sha1(identifier.encode('utf8')).hexdigest()
+        return self._hash[1]
 
 
 class SystemComposition(object):
@@ -139,6 +156,8 @@ class SystemComposition(object):
 
     """
 
+    __slots__ = ('name', 'jvm', 'node_setting', '_flow', '_hash', '_elements')
+
     def __init__(self, jvm, node_setting, name=None):
         """
         :param jvm: the associated jvm
@@ -150,6 +169,10 @@ class SystemComposition(object):
         self.jvm = jvm
         self.node_setting = node_setting
         self._flow = []
+        # hexdigests of the jvm and node setting and the combined hexdigest
+        self._hash = None
+        # parts the elements were collected from, length of flow, elements
+        self._elements = None
 
     def __eq__(self, other):
         try:
@@ -161,7 +184,7 @@ class SystemComposition(object):
         return self.jvm != other.jvm or self.node_setting != other.node_setting
 
     def __hash__(self):
-        return hash(hash(self.jvm) + hash(self.node_setting))
+        return hash((self.jvm, self.node_setting))
 
     def __str__(self):  # pragma: no cover
         return self.name
@@ -176,10 +199,12 @@ class SystemComposition(object):
         :returns: sha1 hexdigest of instance
         :rtype: str
         """
-        hasher = sha1()
-        update_hasher(hasher, self.jvm.hash())
-        update_hasher(hasher, self.node_setting.hash())
-        return hasher.hexdigest()
+        # the jvm (e.g. its workload) may change, so its hash can't be cached
+        hashes = self.jvm.hash(), self.node_setting.hash()
+        if self._hash is None or self._hash[0] != hashes:
+            # hexdigests are ascii
+            self._hash = hashes, sha1(''.join(hashes).encode('ascii')).hexdigest()
+        return self._hash[1]
 
     def set_timeout_function(self, fun):
         """
@@ -210,7 +235,10 @@ class SystemComposition(object):
         :param flow: flow of execution after JVM
         :type flow: List of :class:`Edge` or :class:`Pipeline`
         """
-        self._flow = list(chain.from_iterable(e.edges for e in flow))
+        edges = []
+        for e in flow:
+            edges.extend(e.edges)
+        self._flow = edges
 
     @property
     def starts(self):
@@ -226,20 +254,31 @@ class SystemComposition(object):
     @property
     def elements(self):
         """
-        All :class:`~penchy.jobs.elements.PipelineElement` of this composition.
+        All :class:`~penchy.jobs.elements.PipelineElement` of this composition
+        (as a :class:`frozenset`).
         """
         if not self._flow:
             log.warn('No flow set')
 
+        # the elements only change with the flow or the parts of the jvm
+        jvm = self.jvm
+        parts = (self._flow, jvm, jvm.workload, jvm.tool)
+        cached = self._elements
+        if cached is not None and cached[1] == len(self._flow) and \
+                all(x is y for x, y in zip(cached[0], parts)):
+            return cached[2]
+
         elements = set(e.source for e in self._flow)
         elements.update(e.sink for e in self._flow)
-        if self.jvm.workload:
-            elements.add(self.jvm.workload)
-        if self.jvm.tool:
-            elements.add(self.jvm.tool)
-        if isinstance(self.jvm, PipelineElement):
-            elements.add(self.jvm)
-
+        if jvm.workload:
+            elements.add(jvm.workload)
+        if jvm.tool:
+            elements.add(jvm.tool)
+        if isinstance(jvm, PipelineElement):
+            elements.add(jvm)
+
+        elements = frozenset(elements)
+        self._elements = parts, len(self._flow), elements
         return elements
 
     @property
@@ -275,26 +314,41 @@ class Job(object):
     - ``job.filename`` has to be set to the filename of the job
     """
 
-    def __init__(self, compositions, server_flow, invocations=1):
+    def __init__(self, compositions, server_flow, invocations=1, strict=True):
         """
         :param compositions: :class:`SystemComposition` to execute jobs on
-        :type compositions: List of :class:`SystemComposition`
+        :type compositions: List (or tuple) of :class:`SystemComposition`
                               or :class:`SystemComposition`
         :param server_flow: describes the execution of the job on the server
         :type server_flow: List of :class:`~penchy.jobs.dependency.Edge` or
                            :class:`~penchy.jobs.dependency.Pipeline`
         :param invocations: number of times to run job on each configuration
         :type invocations: int
-        """
-        self.compositions = compositions if isinstance(compositions, list) \
-                            else [compositions]
-        self.server_flow = list(chain.from_iterable(dep.edges for dep in server_flow))
+        :param strict: check the type of every element of the inputs of all
+                       pipeline elements, if ``False`` only the outermost types
+                       are checked
+        :type strict: bool
+        """
+        if isinstance(compositions, list):
+            self.compositions = compositions
+        elif isinstance(compositions, tuple):
+            self.compositions = list(compositions)
+        else:
+            self.compositions = [compositions]
+        self.server_flow = []
+        for dep in server_flow:
+            self.server_flow.extend(dep.edges)
         self.invocations = invocations
+        self.strict = strict
         self.send = None
         self.timeout = None
         self.receive = None
         self._composition = None
         self.filename = None
+        # id of flow -> (flow, edges of flow, starts, edge order)
+        self._edge_orders = {}
+        # client dependencies -> classpath
+        self._classpaths = {}
 
     def run(self, composition):
         """
@@ -303,47 +357,60 @@ class Job(object):
         :param composition: composition to run.
         :type composition: :class:`SystemComposition`
         """
-        # setup
-        pomfile = os.path.join(composition.node_setting.path, 'pom.xml')
-        setup_dependencies(pomfile, self._get_client_dependencies(composition))
-        composition.jvm.add_to_cp(get_classpath(pomfile))
+        # setup, compositions with the same dependencies share the classpath
+        dependencies = frozenset(self._get_client_dependencies(composition))
+        classpath = self._classpaths.get(dependencies)
+        if classpath is None:
+            pomfile = os.path.join(composition.node_setting.path, 'pom.xml')
+            setup_dependencies(pomfile, dependencies)
+            classpath = self._classpaths[dependencies] = get_classpath(pomfile)
+        composition.jvm.add_to_cp(classpath)
         self._composition = composition
 
         # save send for restoring
         send = self.send
-        # replace with one that knows how to identify the composition if it is set
+        # replace with one that collects the data of all Sends to transmit it
+        # at once after the pipeline has run
+        sent = []
         if self.send is not None:
-            self.send = partial(self.send, composition.hash())
+            self.send = sent.append
 
         composition.jvm.basepath = composition.node_setting.basepath
 
-        _, edge_order = edgesort(composition.starts, composition.flow)
+        edge_order = self._edge_order(composition.starts, composition.flow)
 
         for i in range(1, self.invocations + 1):
-            log.info('Run invocation {0}'.format(i))
+            log.info('Run invocation %s', i)
             with tempdir(prefix='penchy-invocation{0}-'.format(i)):
                 composition.jvm.run()
 
         log.info('Run pipeline')
-        for sink, group in groupby(edge_order, attrgetter('sink')):
-            kwargs = build_keys(group)
-            if isinstance(sink, SystemFilter):
-                kwargs[':environment:'] = self._build_environment()
-            log.debug('Passing this input to {0}:\n{1}'
-                      .format(sink.__class__.__name__,
-                              kwargs))
-            try:
-                sink.run(**kwargs)
-            except TypeCheckError:
-                log.error('Type check failed on component {0} and arguments {1}'
-                          .format(sink.__class__.__name__, kwargs))
-                raise
-            except WrongInputError:
-                log.error('Run failed on component {0} and arguments {1}'
-                          .format(sink.__class__.__name__, kwargs))
-                raise
-            log.debug('{0} transformed input to:\n{1}'
-                      .format(sink.__class__.__name__, sink.out))
+        environment = self._build_environment()
+        try:
+            for sink, group in edge_order:
+                kwargs = build_keys(group)
+                if isinstance(sink, SystemFilter):
+                    kwargs[':environment:'] = environment
+                log.debug('Passing this input to %s:\n%s',
+                          sink.__class__.__name__, kwargs)
+                try:
+                    sink.run(check_elements=self.strict and sink.validate_elements,
+                             **kwargs)
+                except TypeCheckError:
+                    log.error('Type check failed on component {0} and arguments {1}'
+                              .format(sink.__class__.__name__, kwargs))
+                    raise
+                except WrongInputError:
+                    log.error('Run failed on component {0} and arguments {1}'
+                              .format(sink.__class__.__name__, kwargs))
+                    raise
+                log.debug('%s transformed input to:\n%s',
+                          sink.__class__.__name__, sink.out)
+        finally:
+            # send the collected data identified by the composition, also if
+            # a later element failed so that the server gets partial results
+            if sent:
+                self._send_collected(send, composition, sent)
 
         # reset state of filters for running multiple configurations
         composition._reset()
@@ -351,6 +418,62 @@ class Job(object):
         self.send = send
         self._composition = None
 
+    def _send_collected(self, send, composition, sent):
+        """
+        Send the data collected from the Sends of ``composition`` at once.
+
+        If several Sends send values of the same name, the value of the last
+        one is sent.
+
+        :param send: function to send the data with
+        :type send: function of the hash of ``composition`` and the data
+        :param composition: composition the data belongs to
+        :type composition: :class:`SystemComposition`
+        :param sent: the data of every Send in the order they ran
+        :type sent: list of dicts
+        """
+        data = {}
+        for datum in sent:
+            for name in datum:
+                if name in data:
+                    log.warn('Sent value "%s" is overwritten by a later Send',
+                             name)
+            data.update(datum)
+        send(composition.hash(), data)
+
+    def _edge_order(self, starts, flow):
+        """
+        Return the topological sorted edges of ``flow`` (see
+        :func:`~penchy.jobs.dependency.edgesort`) grouped by their sink.
+
+        The order is cached as long as neither the edges of ``flow`` nor the
+        ``starts`` change.
+
+        :raises: :exc:`ValueError` if no topological sort is possible
+        :param starts: the elements of ``flow`` that have no dependencies
+        :type starts: list of :class:`~penchy.jobs.elements.PipelineElement`
+        :param flow: the flow to sort
+        :type flow: list of :class:`~penchy.jobs.dependency.Edge`
+        :returns: sorted pairs of sink and the edges that lead to it
+        :rtype: list of (:class:`~penchy.jobs.elements.PipelineElement`,
+                list of :class:`~penchy.jobs.dependency.Edge`)
+        """
+        edges = tuple(flow)
+        starts = tuple(starts)
+        cached = self._edge_orders.get(id(flow))
+        if cached is not None and cached[0] is flow and \
+                cached[1] == edges and cached[2] == starts:
+            return cached[3]
+
+        # edgesort emits all edges of a sink in one run
+        edge_order = []
+        for edge in edgesort(starts, edges)[1]:
+            if not edge_order or edge_order[-1][0] is not edge.sink:
+                edge_order.append((edge.sink, []))
+            edge_order[-1][1].append(edge)
+        self._edge_orders[id(flow)] = flow, edges, starts, edge_order
+        return edge_order
+
     def _get_client_dependencies(self, composition):
         """
         Return all clientside :class:`MavenDependency` of this job for a given
@@ -379,29 +502,29 @@ class Job(object):
         if not self.server_flow:
             return
 
-        starts = [edge.source for edge in self.server_flow
-                  if isinstance(edge.source, Receive)]
+        starts = self._server_starts()
 
         if not starts:
             log.error('There is no Receiver in the serverside flow. Aborting.')
             raise ValueError('There is no Receiver in the serverside flow')
 
-        _, edge_order = edgesort(starts, self.server_flow)
+        edge_order = self._edge_order(starts, self.server_flow)
 
         # all starts are receivers, run them with the environment
+        environment = self._build_environment()
         for start in starts:
-            start.run(**{':environment:': self._build_environment()})
+            start.run(**{':environment:': environment})
 
         # run other filters
-        for sink, group in groupby(edge_order, attrgetter('sink')):
+        for sink, group in edge_order:
             kwargs = build_keys(group)
             if isinstance(sink, SystemFilter):
-                kwargs[':environment:'] = self._build_environment()
-            log.debug('Passing this input to {0}:\n{1}'
-                      .format(sink.__class__.__name__,
-                              kwargs))
+                kwargs[':environment:'] = environment
+            log.debug('Passing this input to %s:\n%s',
+                      sink.__class__.__name__, kwargs)
             try:
-                sink.run(**kwargs)
+                sink.run(check_elements=self.strict and sink.validate_elements,
+                         **kwargs)
             except TypeCheckError:
                 log.error('Type check failed on component {0} and arguments {1}'
                           .format(sink.__class__.__name__, kwargs))
@@ -410,8 +533,18 @@ class Job(object):
                 log.error('Run failed on component {0} and arguments {1}'
                           .format(sink.__class__.__name__, kwargs))
                 raise
-            log.debug('{0} transformed input to:\n{1}'
-                      .format(sink.__class__.__name__, sink.out))
+            log.debug('%s transformed input to:\n%s',
+                      sink.__class__.__name__, sink.out)
+
+    def _server_starts(self):
+        """
+        Return the :class:`~penchy.jobs.filters.Receive` filters of the
+        serverside pipeline, each only once even if it has several edges.
+
+        :rtype: list of :class:`~penchy.jobs.filters.Receive`
+        """
+        return unify(e for e in (edge.source for edge in self.server_flow)
+                     if isinstance(e, Receive))
 
     def _get_server_dependencies(self):
         """
@@ -420,8 +553,11 @@ class Job(object):
         :returns: Set of :class:`MavenDependency`.
         :rtype: set
         """
-        return set(chain.from_iterable(element.DEPENDENCIES for element
-                                       in self.server_flow))
+        dependencies = set()
+        for edge in self.server_flow:
+            dependencies.update(edge.source.DEPENDENCIES)
+            dependencies.update(edge.sink.DEPENDENCIES)
+        return dependencies
 
     def _build_environment(self):
         """
@@ -439,8 +575,8 @@ class Job(object):
         """
         # replace receive and send with dummy functions if not set to avoid
         # corner cases in pipeline
-        receive = default(self.receive, lambda: {})
-        send = default(self.send, lambda data: None)
+        receive = default(self.receive, _receive_nothing)
+        send = default(self.send, _send_nothing)
 
         return dict(receive=receive,
                     send=send,
@@ -457,6 +593,8 @@ class Job(object):
         :returns: :class:`SystemComposition` of job that run on host
         :rtype: list
         """
+        # no index by node: compositions and their hosts may change at any
+        # time and checking an index for that is a scan as well
         return [c for c in self.compositions if c.node_setting.identifier == identifier]
 
     def check(self):
@@ -481,41 +619,39 @@ class Job(object):
                 valid = False
             # check if there are cycles in client pipelines
             try:
-                edgesort(composition.starts, composition.flow)
+                self._edge_order(composition.starts, composition.flow)
             except ValueError:
                 log.exception('Check: cycle on composition "{0}"'
                               .format(composition))
                 valid = False
 
-            if not any(isinstance(e, Send) for e in composition.elements):
+            elements = composition.elements
+            if not any(isinstance(e, Send) for e in elements):
                 log.error('Check: there is no Send in composition "{0}"'
                           .format(composition))
                 valid = False
 
-            if any(isinstance(e, Plot) for e in composition.elements):
+            if any(isinstance(e, Plot) for e in elements):
                 log.error('Check: there is a Plot in composition "{0}"'
                           .format(composition))
                 valid = False
 
         # check if there are cycles in server pipeline
-        starts = [edge.source for edge in self.server_flow
-                  if isinstance(edge.source, Receive)]
+        starts = self._server_starts()
         if not starts:
             # if there are no receivers the server pipeline is not valid
             log.error('Check: There is no Receiver in server pipeline')
             valid = False
         else:
             try:
-                edgesort(starts, self.server_flow)
+                self._edge_order(starts, self.server_flow)
             except ValueError:
                 log.exception('Check: cycle in server pipeline')
                 valid = False
 
-        for flow in chain(chain(c.flow for c in self.compositions),
-                         [self.server_flow]):
-            valid = valid and self._check_flow(flow)
-
-        return valid
+        # stops at the first invalid flow
+        flows = chain((c.flow for c in self.compositions), [self.server_flow])
+        return valid and all(self._check_flow(flow) for flow in flows)
 
     def _check_flow(self, flow):
         """
@@ -573,27 +709,29 @@ class Job(object):
             :type flow: list of :class:`~penchy.jobs.dependency.Edge`
             :param flow_id: id to differentiate between multiple flows with same elements
             :type flow_id: int
-            :returns: edges in graphviz format
+            :returns: nodes and edges in graphviz format
             :rtype: list of str
             """
-
-            return [""" node{source_id}{id} [label = "{source}"];
-                        node{sink_id}{id} [label = "{sink}"];
-                        node{source_id}{id} -> node{sink_id}{id} [label = "{decoration}"];
-                    """
-                    .format(source=e.source,
-                            source_id=id(e.source),
-                            sink=e.sink,
-                            sink_id=id(e.sink),
-                            id=flow_id,
-                            decoration=', '.join('{0} -> {1}'
-                                                 .format(m[0], m[1])
-                                                 if m[0] != m[1]
-                                                 else m[0]
-                                                 for m in e.map_
-                                             )
-                                    if e.map_ else '')
-                    for e in flow]
+            # declare every node once, not once per edge
+            seen = set()
+            nodes = []
+            edges = []
+            for e in flow:
+                for element in (e.source, e.sink):
+                    if id(element) not in seen:
+                        seen.add(id(element))
+                        nodes.append(' node{0}{1} [label = "{2}"];'
+                                     .format(id(element), flow_id, element))
+                if e.map_:
+                    decoration = ', '.join(m[0] if m[0] == m[1] else
+                                           '{0} -> {1}'.format(*m)
+                                           for m in e.map_)
+                else:
+                    decoration = ''
+                edges.append(' node{0}{2} -> node{1}{2} [label = "{3}"];'
+                             .format(id(e.source), id(e.sink), flow_id,
+                                     decoration))
+            return nodes + edges
 
         clients = ["""
                    subgraph cluster_client%d {
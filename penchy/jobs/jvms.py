@@ -11,10 +11,9 @@ import logging
 import os
 import shlex
 import subprocess
-from hashlib import sha1
 from tempfile import NamedTemporaryFile
 
-from penchy.compat import update_hasher, nested, path
+from penchy.compat import sha1, update_hasher, nested, path
 from penchy.jobs.elements import PipelineElement
 from penchy.jobs.hooks import Hook
 from penchy.jobs.typecheck import Types
@@ -158,24 +157,25 @@ class JVM(object):
         for hook in hooks:
             hook.setup()
 
-        log.debug("executing {0}".format(self.cmdline))
+        cmdline = self.cmdline
+        log.debug("executing %s", cmdline)
         with nested(NamedTemporaryFile(delete=False, dir='.'),
                     NamedTemporaryFile(delete=False, dir='.')) \
             as (stderr, stdout):
-            self.proc = subprocess.Popen(self.cmdline,
+            self.proc = subprocess.Popen(cmdline,
                     stdout=stdout, stderr=stderr)
 
             # measure usertime before
             before = os.times()[0]
-            log.debug('CPU time before invocation: {0}'.format(before))
+            log.debug('CPU time before invocation: %s', before)
 
             self.proc.communicate()
 
             # measure usertime after
             after = os.times()[0]
             diff = after - before
-            log.debug('CPU time after invocation: {0}, difference: '
-                      '{1}'.format(after, diff))
+            log.debug('CPU time after invocation: %s, difference: %s',
+                      after, diff)
 
             if diff > 0.1:
                 log.error('High cpu difference: {0} seconds'.format(diff))
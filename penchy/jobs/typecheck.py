@@ -89,7 +89,7 @@ class Types(object):
         """
         return set(self.descriptions) if self.descriptions is not None else set()
 
-    def check_input(self, kwargs):
+    def check_input(self, kwargs, check_elements=True):
         """
         Check if ``kwargs`` satisfies the descriptions .
         That is:
@@ -103,6 +103,10 @@ class Types(object):
 
         :param kwargs: arguments for run of a :class:`PipelineElement`
         :type kwargs: dict
+        :param check_elements: check the subtypes, i.e. the elements of
+                               sequences; if ``False`` only the outermost type
+                               is checked
+        :type check_elements: bool
         :returns: count of unused inputs
         :rtype: int
         """
@@ -111,6 +115,8 @@ class Types(object):
             return 0
 
         for name, types in self.descriptions.items():
+            if not check_elements:
+                types = types[:1]
             count = len(types)
             if name not in kwargs:
                 raise TypeCheckError('Argument {0} is missing'.format(name))
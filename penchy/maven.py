@@ -19,12 +19,12 @@ from penchy.util import memoized, tree_pp, dict2tree, sha1sum
 log = logging.getLogger(__name__)
 
 
-@memoized
 def get_classpath(path=None):
     """
     Returns the Java classpath using Maven.
 
-    This method expects a Maven POM (pom.xml).
+    This method expects a Maven POM (pom.xml). Maven is only executed again
+    if the contents of the POM have changed.
     A POM can be generated using the
     :class:`BootstrapPOM` or :class:`POM` class::
 
@@ -52,8 +52,24 @@ def get_classpath(path=None):
         raise OSError('No pom-file found at {0}!'.format(path))
 
     if path:
-        log.debug('Using %s' % path)
+        log.debug('Using %s', path)
+
+    return _build_classpath(os.path.abspath(path), sha1sum(path))
+
+
+@memoized
+def _build_classpath(path, checksum):
+    """
+    Returns the Java classpath Maven builds for the POM at ``path``.
 
+    :param path: path to the pom.xml
+    :type path: string
+    :param checksum: sha1 hexdigest of the POM (distinguishes the cached
+                     classpaths of different contents at the same path)
+    :type checksum: string
+    :returns: java classpath
+    :rtype: string
+    """
     cmd = ['mvn', '-f', path, 'dependency:build-classpath']
     log.info('Executing maven. This may take a while')
     proc = Popen(cmd, stdout=PIPE)
@@ -1,5 +1,5 @@
 from penchy.compat import unittest
-from penchy.jobs.elements import Workload, Tool
+from penchy.jobs.elements import PipelineElement, Workload, Tool
 from penchy.jobs.hooks import Hook
 from penchy.tests.util import MockPipelineElement
 
@@ -30,6 +30,80 @@ class PipelineElementHookTest(unittest.TestCase):
         self.assertListEqual(self.list_, [1, 1, 1])
 
 
+class PipelineElementMemoizeTest(unittest.TestCase):
+    def setUp(self):
+        self.e = MockPipelineElement()
+        self.runs = []
+
+        def _run(**kwargs):
+            self.runs.append(kwargs)
+            self.e.out['sum'] = sum(kwargs['values'])
+        self.e._run = _run
+        self.e.memoize = True
+
+    def test_reuse(self):
+        self.e.run(values=[1, 2])
+        self.e.reset()
+        self.e.run(values=[1, 2])
+        self.assertEqual(self.e.out['sum'], 3)
+        self.assertEqual(len(self.runs), 1)
+
+    def test_different_inputs(self):
+        self.e.run(values=[1, 2])
+        self.e.reset()
+        self.e.run(values=[1, 3])
+        self.assertEqual(self.e.out['sum'], 4)
+        self.assertEqual(len(self.runs), 2)
+
+    def test_bounded(self):
+        self.e.memoize_size = 2
+        for i in range(3):
+            self.e.run(values=[i])
+        self.assertEqual(len(self.e._memo), 2)
+
+    def test_least_recently_used_dropped(self):
+        self.e.memoize_size = 2
+        for i in (1, 2, 1, 3, 1):
+            self.e.run(values=[i])
+        self.assertEqual(len(self.runs), 3)
+
+    def test_distinct_types(self):
+        self.e.run(values=[1, 2])
+        self.e.reset()
+        self.e.run(values=[1.0, 2.0])
+        self.assertIsInstance(self.e.out['sum'], float)
+        self.assertEqual(len(self.runs), 2)
+
+    def test_outputs_copied(self):
+        def _run(**kwargs):
+            self.e.out['values'] = list(kwargs['values'])
+        self.e._run = _run
+
+        self.e.run(values=[1, 2])
+        self.e.out['values'].append(3)
+        for _ in range(2):
+            self.e.reset()
+            self.e.run(values=[1, 2])
+            self.assertListEqual(self.e.out['values'], [1, 2])
+            self.e.out['values'].append(3)
+
+    def test_without_init(self):
+        class Element(PipelineElement):
+            memoize = True
+
+            def __init__(self):
+                self.hooks = []
+                self.reset()
+
+            def _run(self, **kwargs):
+                self.out['values'] = kwargs['values']
+
+        e = Element()
+        e.run(values=[1])
+        e.run(values=[1])
+        self.assertListEqual(e.out['values'], [1])
+
+
 class NotRunnableTest(unittest.TestCase):
     def test_throw_exception(self):
         w = Workload()
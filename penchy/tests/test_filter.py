@@ -1,5 +1,8 @@
+import io
 import itertools
 import json
+import logging
+import operator
 import os
 import tempfile
 from numpy import average, std
@@ -7,7 +10,9 @@ from numpy.random import random_integers, random_sample
 from tempfile import NamedTemporaryFile
 
 from penchy.compat import unittest, write
+from penchy.deploy import Deploy
 from penchy.jobs.filters import *
+from penchy.jobs.jvms import JVM
 from penchy.jobs.typecheck import Types
 from penchy.util import tempdir
 from penchy.tests.util import get_json_data, make_system_composition
@@ -56,12 +61,30 @@ class DacapoHarnessTest(unittest.TestCase):
         self.d.run(stderr=stderr)
         self.assertListEqual(self.d.out['failures'], [1] * invocations)
 
+    def test_benchmark_output(self):
+        f = write_to_tempfiles(["""\
+===== DaCapo 9.12 fop starting =====
+===== DaCapo 9.12 fop PASSED in 3133 msec =====
+benchmark says: FAILED in 42 msec
+"""])
+        self.d.run(stderr=[f[0].name])
+        f[0].close()
+        self.assertListEqual(self.d.out['times'], [[3133]])
+        self.assertListEqual(self.d.out['failures'], [0])
+
     def test_wrong_input(self):
         stderr = [i.name for i in self.wrong_input]
         for e in stderr:
             with self.assertRaises(WrongInputError):
                 self.d.run(stderr=[e])
 
+    def test_parallel(self):
+        stderr = [i.name for i in itertools.chain(self.mi, self.failed)]
+        self.d.run(stderr=stderr)
+        d = DacapoHarness(parallel=True)
+        d.run(stderr=stderr)
+        self.assertDictEqual(d.out, self.d.out)
+
     def _assert_correct_out(self, invocations):
         self.assertSetEqual(set(self.d.out), self.d._output_names)
         self.assertEqual(len(self.d.out['failures']), invocations)
@@ -106,6 +129,25 @@ class HProfCpuTimesTest(unittest.TestCase):
             self.assertEqual(len(self.h.out[k]), invocations)
 
 
+class HProfHeapSitesTest(unittest.TestCase):
+    def test_sites(self):
+        f = write_to_tempfiles(["""\
+SITES BEGIN (ordered by live bytes) Fri Apr  1 13:06:24 2011
+          percent          live          alloc'ed  stack class
+ rank   self  accum     bytes objs     bytes  objs trace name
+    1 44.73% 44.73%   1161280 14516  1161280 14516 302032 char[]
+    2  8.95% 53.68%    232256 14516   232256 14516 302033 java.lang.String
+SITES END
+"""])
+        h = HProfHeapSites()
+        h.run(hprof=[f[0].name])
+        f[0].close()
+        self.assertEqual(h.out['rank'], [[1, 2]])
+        self.assertEqual(h.out['self'], [[44.73, 8.95]])
+        self.assertEqual(h.out['trace'], [[302032, 302033]])
+        self.assertEqual(h.out['class'], [['char[]', 'java.lang.String']])
+
+
 class TamiflexTest(unittest.TestCase):
 
     @classmethod
@@ -131,6 +173,15 @@ class TamiflexTest(unittest.TestCase):
         self.h.run(reflection_log=ref_log)
         self._assert_correct_out(invocations)
 
+    def test_columns(self):
+        self.h.run(reflection_log=[self.si[0].name])
+        self.assertEqual(self.h.out['kind'][0][0], 'Class.forName')
+        self.assertEqual(self.h.out['name'][0][0], 'avrora.Main')
+        self.assertEqual(self.h.out['parent_name'][0][0],
+                         'org.dacapo.harness.Avrora.<init>')
+        self.assertEqual(self.h.out['line'][0][0], '26')
+        self.assertEqual(self.h.out['optional'][0][0], '')
+
     def test_wrong_input(self):
         ref_logs = [i.name for i in self.wrong_input]
         for ref_log in ref_logs:
@@ -221,6 +272,11 @@ class MergeTest(unittest.TestCase):
         f._run(results=self.results)
         self.assertEqual(f.out, {'col1': [42, 0], 'col2': ['id1', 'id2']})
 
+    def test_implicit_value_first(self):
+        f = Merge(('col1', 'col2'), [(Value('id1'), 'a'), (Value('id2'), 'c')])
+        f._run(results=self.results)
+        self.assertEqual(f.out, {'col1': ['id1', 'id2'], 'col2': [42, 21]})
+
     def test_implicit_fail(self):
         f = Merge(('col1', 'col2'), [('a', Value('id1')), ('d', Value('id2'))])
         with self.assertRaises(WrongInputError):
@@ -352,6 +408,12 @@ class StatisticRuntimeEvaluationTest(unittest.TestCase):
                     self.assertAlmostEqual(actual, expected)
             f.reset()
 
+    def test_no_invocations(self):
+        f = StatisticRuntimeEvaluation()
+        f._run(times=[])
+        for values in f.out.values():
+            self.assertEqual(values, [])
+
 
 class EvaluationTest(unittest.TestCase):
 
@@ -443,6 +505,21 @@ class SaveTest(unittest.TestCase):
 
         os.remove(save_path)
 
+    def test_save_relative_twice(self):
+        save_file = 'penchy-save-test'
+        comp = make_system_composition()
+        comp.node_setting.path = '/tmp'
+        save_path = os.path.join(comp.node_setting.path, save_file)
+
+        save = Save(save_file)
+        for s in ("'tis a test string", "'tis another test string"):
+            save.run(data=s, **{':environment:' : {'current_composition': comp}})
+            with open(save_path) as f:
+                self.assertEqual(f.read(), s)
+        self.assertEqual(save.target_path, save_file)
+
+        os.remove(save_path)
+
     def test_save_absolute(self):
         s = "'tis a test string"
         save_path = '/tmp/penchy-save-test'
@@ -465,6 +542,75 @@ class ReadTest(unittest.TestCase):
             r.run(paths=[f.name])
             self.assertListEqual(r.out['data'], [s])
 
+    def test_read_multiple(self):
+        strings = ['{0}'.format(i) * i for i in range(1, 12)]
+        files = write_to_tempfiles(strings)
+        r = Read('utf8')
+        r.run(paths=[f.name for f in files])
+        for f in files:
+            f.close()
+        self.assertListEqual(r.out['data'], strings)
+
+
+class RecordingDeploy(Deploy):
+    def __init__(self, events):
+        self.events = events
+        self._connected = False
+
+    def connect(self):
+        self.events.append('connect')
+        self._connected = True
+
+    def disconnect(self):
+        self.events.append('disconnect')
+        self._connected = False
+
+    def put(self, local, remote):
+        self.events.append((local, remote))
+
+    @property
+    def connected(self):
+        return self._connected
+
+
+class UploadTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+
+    def test_upload_batch(self):
+        u = UploadBatch(RecordingDeploy, self.events)
+        u.run(filenames=['a.svg', 'b.svg'], remote_paths=['/x/a', '/x/b'])
+        self.assertListEqual(self.events, ['connect',
+                                           ('a.svg', '/x/a'),
+                                           ('b.svg', '/x/b'),
+                                           'disconnect'])
+
+    def test_upload_batch_twice(self):
+        u = UploadBatch(RecordingDeploy, self.events)
+        for name in ('a.svg', 'b.svg'):
+            u.run(filenames=[name], remote_paths=['/x/' + name])
+        self.assertListEqual(self.events, ['connect', ('a.svg', '/x/a.svg'),
+                                           'disconnect',
+                                           'connect', ('b.svg', '/x/b.svg'),
+                                           'disconnect'])
+
+    def test_upload_batch_mismatch(self):
+        u = UploadBatch(RecordingDeploy, self.events)
+        with self.assertRaises(WrongInputError):
+            u.run(filenames=['a.svg', 'b.svg'], remote_paths=['/x/a'])
+        self.assertListEqual(self.events, [])
+
+    def test_upload(self):
+        u = Upload(RecordingDeploy, '/x/plot.svg', self.events)
+        u.run(filename='plot.svg')
+        self.assertListEqual(self.events, ['connect',
+                                           ('plot.svg', '/x/plot.svg'),
+                                           'disconnect'])
+
+    def test_no_deploy(self):
+        with self.assertRaises(ValueError):
+            UploadBatch(object)
+
 
 class ServerFlowSystemFilterTest(unittest.TestCase):
     def setUp(self):
@@ -487,6 +633,27 @@ class ServerFlowSystemFilterTest(unittest.TestCase):
         self.assertItemsEqual(numbers, dump['data']['numbers'])
         self.assertItemsEqual(strings, dump['data']['strings'])
 
+    def test_dump_composition_information_once(self):
+        calls = []
+        comp = make_system_composition()
+        comp.jvm.information = lambda: calls.append(1) or {'jvm': 'dummy'}
+        self.env['current_composition'] = comp
+        d = Dump()
+        for _ in range(2):
+            d._run(numbers=[1], **{':environment:' : dict(self.env)})
+            dump = json.loads(d.out['dump'])
+            self.assertEqual(dump['system']['jvm'], {'jvm': 'dummy'})
+            self.assertEqual(dump['system']['composition'], comp.name)
+        self.assertEqual(len(calls), 1)
+
+        # the information is gathered again for a changed jvm
+        comp.jvm = JVM('other')
+        comp.jvm.information = lambda: calls.append(1) or {'jvm': 'other'}
+        d._run(numbers=[1], **{':environment:' : dict(self.env)})
+        dump = json.loads(d.out['dump'])
+        self.assertEqual(dump['system']['jvm'], {'jvm': 'other'})
+        self.assertEqual(len(calls), 2)
+
     def test_save_and_backup(self):
         data = "'tis the end"
         with tempdir(delete=True):
@@ -513,6 +680,10 @@ class MeanTest(unittest.TestCase):
         f._run(values=rnd)
         self.assertAlmostEqual(f.out['mean'], average(rnd))
 
+    def test_numeric_strings(self):
+        with self.assertRaises(TypeCheckError):
+            Mean().run(values=['1', '2'])
+
 
 class StandardDeviationTest(unittest.TestCase):
     def test_against_numpy_integes(self):
@@ -527,6 +698,10 @@ class StandardDeviationTest(unittest.TestCase):
         f._run(values=rnd)
         self.assertAlmostEqual(f.out['standard_deviation'], std(rnd, ddof=1))
 
+    def test_numeric_strings(self):
+        with self.assertRaises(TypeCheckError):
+            StandardDeviation().run(values=['1', '3'])
+
 
 class SumTest(unittest.TestCase):
     def test_integers(self):
@@ -541,6 +716,15 @@ class SumTest(unittest.TestCase):
         f._run(values=rnd)
         self.assertAlmostEqual(f.out['sum'], sum(rnd))
 
+    def test_large_integers(self):
+        f = Sum()
+        f._run(values=[2 ** 62, 2 ** 62])
+        self.assertEqual(f.out['sum'], 2 ** 63)
+
+        f = Map(Sum())
+        f._run(values=[[2 ** 62, 2 ** 62], [1, 2]])
+        self.assertListEqual(f.out['values'], [2 ** 63, 3])
+
 
 class EnumerateTest(unittest.TestCase):
     def test_preserves_input(self):
@@ -553,6 +737,11 @@ class EnumerateTest(unittest.TestCase):
         f._run(values=['a', 'b', 'c'])
         self.assertEqual(f.out['numbers'], [3, 5, 7])
 
+    def test_enumerate_array(self):
+        f = Enumerate(step=3)
+        f._run(values=random_sample(4))
+        self.assertEqual(f.out['numbers'], [0, 3, 6, 9])
+
 
 class UnpackTest(unittest.TestCase):
     def test_valid(self):
@@ -560,6 +749,12 @@ class UnpackTest(unittest.TestCase):
         f._run(singleton=[1])
         self.assertEqual(f.out['result'], 1)
 
+    def test_preserves_input(self):
+        singleton = [1]
+        f = Unpack()
+        f._run(singleton=singleton)
+        self.assertEqual(singleton, [1])
+
     def test_list_too_long(self):
         f = Unpack()
         with self.assertRaises(WrongInputError):
@@ -600,6 +795,38 @@ class MapTest(unittest.TestCase):
         f._run(a=[1, 2, 3])
         self.assertEqual(f.out['b'], [1, 2, 3])
 
+    def test_memoized_filter(self):
+        runs = []
+
+        class Double(Filter):
+            inputs = Types(('value', int))
+            outputs = Types(('value', int))
+            memoize = True
+
+            def _run(self, **kwargs):
+                runs.append(kwargs['value'])
+                self.out['value'] = 2 * kwargs['value']
+
+        f = Map(Double())
+        f._run(values=[1, 2, 1, 1])
+        self.assertListEqual(f.out['values'], [2, 4, 2, 2])
+        self.assertListEqual(runs, [1, 2])
+
+    def test_parallel(self):
+        f = Map(Decorate('{0}!'), parallel=True)
+        f._run(values=[[1], [2, 3]])
+        self.assertEqual(f.out['values'], [['1!'], ['2!', '3!']])
+
+    def test_batched(self):
+        f = Map(Sum(), output='sums')
+        f._run(values=[[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(f.out['sums'], [3, 7, 11])
+
+    def test_batched_ragged(self):
+        f = Map(Mean(), output='means')
+        f._run(values=[[1, 2], [3, 4, 5]])
+        self.assertEqual(f.out['means'], [1.5, 4.0])
+
 
 class DecorateTest(unittest.TestCase):
     def test_valid(self):
@@ -612,6 +839,11 @@ class DecorateTest(unittest.TestCase):
         f._run(values=[1, 2, 3])
         self.assertEqual(f.out['values'], ["", "", ""])
 
+    def test_multiple_inputs(self):
+        f = Decorate("{0}-{1}", ['b', 'a'])
+        f._run(a=[1, 2], b=[3, 4])
+        self.assertEqual(f.out['values'], ["3-1", "4-2"])
+
 
 class DropFirstTest(unittest.TestCase):
     def test_valid(self):
@@ -626,6 +858,27 @@ class ZipTest(unittest.TestCase):
         f._run(values=[[1, 2], [3, 4], [5, 6]])
         self.assertEqual(f.out['values'], [[1, 3, 5], [2, 4, 6]])
 
+    def test_floats(self):
+        f = Zip()
+        f._run(values=[[1.5, 2.5], [3.5, 4.5]])
+        self.assertEqual(f.out['values'], [[1.5, 3.5], [2.5, 4.5]])
+
+    def test_mixed(self):
+        f = Zip()
+        f._run(values=[[1, 'a'], [2.5, 'b']])
+        self.assertEqual(f.out['values'], [[1, 2.5], ['a', 'b']])
+        self.assertIsInstance(f.out['values'][0][0], int)
+
+    def test_mixed_numbers(self):
+        f = Zip()
+        f._run(values=[[1.5, 2], [3, 4]])
+        self.assertEqual(f.out['values'], [[1.5, 3], [2, 4]])
+        self.assertIsInstance(f.out['values'][1][0], int)
+
+        f = Zip()
+        f._run(values=[[1, True], [3, 4]])
+        self.assertIs(f.out['values'][1][0], True)
+
 
 class SliceTest(unittest.TestCase):
     def test_slice1(self):
@@ -645,6 +898,31 @@ class ReduceTest(unittest.TestCase):
         f._run(values=[1, 2, 3])
         self.assertEqual(f.out['values'], 6)
 
+    def test_without_initializer(self):
+        f = Reduce(lambda x, y: x * y)
+        f._run(values=[2, 3, 4])
+        self.assertEqual(f.out['values'], 24)
+
+    def test_add(self):
+        f = Reduce(operator.add, 1)
+        f._run(values=[1, 2, 3])
+        self.assertEqual(f.out['values'], 7)
+
+    def test_add_strings(self):
+        f = Reduce(operator.add)
+        f._run(values=['a', 'b'])
+        self.assertEqual(f.out['values'], 'ab')
+
+    def test_add_float_initializer(self):
+        f = Reduce(operator.add, 0.0)
+        f._run(values=[1, 2])
+        self.assertIsInstance(f.out['values'], float)
+
+    def test_empty(self):
+        f = Reduce(operator.mul)
+        f._run(values=[])
+        self.assertIsNone(f.out['values'])
+
 
 class SteadyStateTest(unittest.TestCase):
     def test_one_invocation(self):
@@ -658,6 +936,16 @@ class SteadyStateTest(unittest.TestCase):
                        [15, 36, 21, 1, 2, 15, 47, 7, 19, 28, 39, 29, 32, 17, 15, 18, 14, 8, 39, 0]])
         self.assertEqual(f.out['values'], [[36, 49, 32, 24, 39], [19, 28, 39, 29, 32] ])
 
+    def test_degenerate_windows(self):
+        with self.assertRaises(ZeroDivisionError):
+            SteadyState(k=1, threshold=0.3)._run(values=[[1, 2, 3]])
+        with self.assertRaises(ZeroDivisionError):
+            SteadyState(k=2, threshold=0.3)._run(values=[[1, 2, 0, 0, 5]])
+        # a zero mean after the steady state is never looked at
+        f = SteadyState(k=2, threshold=0.3)
+        f._run(values=[[10, 10, 0, 0, 5]])
+        self.assertEqual(f.out['values'], [[10, 10]])
+
 
 class ConfidenceIntervalMeanTest(unittest.TestCase):
     def test_small_sample_set(self):
@@ -701,6 +989,12 @@ class SortTest(unittest.TestCase):
         self.assertEqual(f.out['b'], ['a', 'c', 'b'])
         self.assertEqual(f.out['c'], [3, 2, 1])
 
+    def test_sort_by_order(self):
+        f = Sort(["b", "a"], reverse=True)
+        f._run(a=[3, 1, 2], b=[1, 2, 1])
+        self.assertEqual(f.out['a'], [1, 3, 2])
+        self.assertEqual(f.out['b'], [2, 1, 1])
+
 
 class AccumulateTest(unittest.TestCase):
     def test_valid(self):
@@ -715,6 +1009,31 @@ class NormalizeTest(unittest.TestCase):
         f._run(values=[67, 22, 7, 5, 3, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], norm=126)
         self.assertAlmostEqual(1.0 - sum(f.out['values']), 0.0)
 
+    def test_values(self):
+        f = Normalize()
+        f._run(values=[1, 3], norm=4)
+        self.assertEqual(f.out['values'], [0.25, 0.75])
+
+    def test_zero_norm(self):
+        f = Normalize()
+        with self.assertRaises(ZeroDivisionError):
+            f._run(values=[1, 3], norm=0)
+
+    def test_empty(self):
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = logging.getLogger('penchy.jobs.filters')
+        logger.addHandler(handler)
+        try:
+            f = Normalize()
+            f._run(values=[], norm=1)
+            f._run(values=[1], norm=2)
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual(f.out['values'], [0.5])
+        self.assertEqual(len(records), 1)
+
 
 class ComposerTest(unittest.TestCase):
     def setUp(self):
@@ -761,7 +1080,7 @@ class ExportTest(unittest.TestCase):
             "v1\tz2\t2\r\n" \
             "v2\tz1\t3\r\n" \
             "v2\tz2\t4\r\n"
-        actual = open(self.tempfile).read()
+        actual = io.open(self.tempfile, newline='').read()
         try:
             self.assertMultiLineEqual(actual, expected)
         finally:
@@ -777,7 +1096,7 @@ class ExportTest(unittest.TestCase):
             "v1\tz2\tbig\r\n" \
             "v2\tz1\tbig\r\n" \
             "v2\tz2\tbig\r\n"
-        actual = open(self.tempfile).read()
+        actual = io.open(self.tempfile, newline='').read()
         try:
             self.assertMultiLineEqual(actual, expected)
         finally:
@@ -791,7 +1110,7 @@ class ExportTest(unittest.TestCase):
             "0\t1\t2\r\n" \
             "1\t0\t3\r\n" \
             "1\t1\t4\r\n"
-        actual = open(self.tempfile).read()
+        actual = io.open(self.tempfile, newline='').read()
         try:
             self.assertMultiLineEqual(actual, expected)
         finally:
@@ -806,7 +1125,20 @@ class ExportTest(unittest.TestCase):
             "batik\t1\t2\r\n" \
             "fop\t0\t3\r\n" \
             "fop\t1\t4\r\n"
-        actual = open(self.tempfile).read()
+        actual = io.open(self.tempfile, newline='').read()
+        try:
+            self.assertMultiLineEqual(actual, expected)
+        finally:
+            os.remove(self.tempfile)
+
+    def test_run_twice(self):
+        f = Export(self.tempfile, ['bench', 'times'], [['batik'].__getitem__])
+        f._run(values=[[1, 2]])
+        self.assertEqual(len(f.functions), 1)
+        f._run(values=[3])
+        expected = "bench\ttimes\r\n" \
+            "batik\t3\r\n"
+        actual = io.open(self.tempfile, newline='').read()
         try:
             self.assertMultiLineEqual(actual, expected)
         finally:
@@ -1,3 +1,6 @@
+import sys
+import time
+
 from penchy.compat import unittest
 from penchy.jobs import hooks
 
@@ -9,3 +12,14 @@ class ExecuteHookTest(unittest.TestCase):
         self.assertIsNone(hook.proc.returncode)
         hook.teardown()
         self.assertEqual(hook.proc.returncode, -15)
+
+    def test_kill(self):
+        hook = hooks.ExecuteHook([sys.executable, '-c',
+                                  'import signal, time\n'
+                                  'signal.signal(signal.SIGTERM, signal.SIG_IGN)\n'
+                                  'time.sleep(60)'], timeout=0.1)
+        hook.setup()
+        # give the command time to ignore SIGTERM
+        time.sleep(1)
+        hook.teardown()
+        self.assertEqual(hook.proc.returncode, -9)
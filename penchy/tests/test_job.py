@@ -2,12 +2,15 @@ import os
 from hashlib import sha1
 
 from penchy.compat import unittest, update_hasher
+from penchy.jobs import job as job_module
 from penchy.jobs.dependency import Edge
-from penchy.jobs.filters import Print, DacapoHarness, Receive, Send
+from penchy.jobs.filters import (Print, DacapoHarness, Receive, Send,
+                                  WrongInputError)
+from penchy.jobs.hooks import Hook
 from penchy.jobs.job import Job, SystemComposition, NodeSetting
 from penchy.jobs.jvms import JVM, ValgrindJVM
 from penchy.jobs.tools import HProf
-from penchy.jobs.typecheck import Types
+from penchy.jobs.typecheck import Types, TypeCheckError
 from penchy.jobs.workloads import ScalaBench
 from penchy.tests.util import MockPipelineElement, make_system_composition
 
@@ -61,6 +64,10 @@ class JobServerElementsTest(unittest.TestCase):
     def test_empty_elements(self):
         self.assertSetEqual(self.job._get_server_dependencies(), set())
 
+    def test_elements(self):
+        job = Job([self.composition], [Edge(Receive(), HProf(''))])
+        self.assertSetEqual(job._get_server_dependencies(), HProf.DEPENDENCIES)
+
 
 class SystemCompositionsTest(unittest.TestCase):
     def setUp(self):
@@ -80,6 +87,27 @@ class SystemCompositionsTest(unittest.TestCase):
         self.assertListEqual(self.job.compositions_for_node('192.168.1.11'),
                              self.multi_host)
 
+    def test_tuple_of_compositions(self):
+        job = Job(tuple(self.single_host + self.multi_host), [])
+        self.assertListEqual(job.compositions,
+                             self.single_host + self.multi_host)
+
+    def test_added_composition(self):
+        self.assertListEqual(self.job.compositions_for_node('baz'), [])
+        c = make_system_composition('baz')
+        self.job.compositions.append(c)
+        self.assertListEqual(self.job.compositions_for_node('baz'), [c])
+
+    def test_replaced_composition(self):
+        old = self.job.compositions[0]
+        self.job._get_client_dependencies(old)
+        c = make_system_composition('baz')
+        self.job.compositions[0] = c
+        self.assertListEqual(self.job.compositions_for_node('baz'), [c])
+        self.job._get_client_dependencies(c)
+        with self.assertRaises(ValueError):
+            self.job._get_client_dependencies(old)
+
     def test_hash(self):
         c = make_system_composition()
         self.assertIn(c, set((c,)))
@@ -123,6 +151,32 @@ class SystemCompositionsTest(unittest.TestCase):
 
         self.assertNotEqual(s1.hash(), s2.hash())
 
+    def test_elements_follow_changes(self):
+        c = make_system_composition()
+        w = ScalaBench('fop')
+        c.jvm.workload = w
+        f = Print()
+        c.flow = [w >> f]
+        self.assertIs(c.elements, c.elements)
+        self.assertSetEqual(set(c.elements), set((w, f)))
+
+        w2 = ScalaBench('batik')
+        c.jvm.workload = w2
+        c.flow = [w2 >> f]
+        self.assertSetEqual(set(c.elements), set((w2, f)))
+
+    def test_changed_host_hash(self):
+        ns = NodeSetting('localhost', 22, 'dummy', '/', '/')
+        s = SystemComposition(JVM('java'), ns)
+        old = s.hash()
+        self.assertEqual(s.hash(), old)
+
+        ns.host = '192.168.1.1'
+        self.assertNotEqual(s.hash(), old)
+        self.assertEqual(s.hash(),
+                         SystemComposition(JVM('java'), NodeSetting(
+                             '192.168.1.1', 22, 'dummy', '/', '/')).hash())
+
 
 class ResetPipelineTest(unittest.TestCase):
     def setUp(self):
@@ -169,6 +223,50 @@ class BuildEnvTest(unittest.TestCase):
         self.assertEqual(env['send']('data'), 42)
 
 
+class JobRunTest(unittest.TestCase):
+    def setUp(self):
+        self.stubs = job_module.setup_dependencies, job_module.get_classpath
+        job_module.setup_dependencies = lambda pomfile, dependencies: None
+        job_module.get_classpath = lambda pomfile: 'classpath'
+
+    def tearDown(self):
+        job_module.setup_dependencies, job_module.get_classpath = self.stubs
+
+    def test_send_once(self):
+        c = make_system_composition()
+        w = MockPipelineElement(['a', 'b'])
+        w.arguments = []
+        c.jvm.workload = w
+        c.jvm.run = lambda: None
+        c.flow = [w >> 'a' >> Send(), w >> 'b' >> Send()]
+        j = Job(c, [])
+        calls = []
+        j.send = lambda *args: calls.append(args)
+
+        j.run(c)
+        self.assertListEqual(calls, [(c.hash(), {'a': 42, 'b': 42})])
+
+    def test_send_before_failure(self):
+        c = make_system_composition()
+        w = MockPipelineElement(['a', 'b'])
+        w.arguments = []
+        c.jvm.workload = w
+        c.jvm.run = lambda: None
+        failing = MockPipelineElement()
+
+        def _run(**kwargs):
+            raise WrongInputError('failed')
+        failing._run = _run
+        c.flow = [w >> 'a' >> Send(), w >> 'b' >> failing]
+        j = Job(c, [])
+        calls = []
+        j.send = lambda *args: calls.append(args)
+
+        with self.assertRaises(WrongInputError):
+            j.run(c)
+        self.assertListEqual(calls, [(c.hash(), {'a': 42})])
+
+
 class RunServerPipelineTest(unittest.TestCase):
     def setUp(self):
         self.receive = Receive()
@@ -181,6 +279,13 @@ class RunServerPipelineTest(unittest.TestCase):
         self.j.run_server_pipeline()
         self.assertDictEqual(self.receive.out, {'results' : self.data})
 
+    def test_receive_once(self):
+        runs = []
+        self.receive.hooks.append(Hook(setup=lambda: runs.append(1)))
+        self.j.server_flow.append(Edge(self.receive, Print()))
+        self.j.run_server_pipeline()
+        self.assertEqual(len(runs), 1)
+
     def test_no_receivers(self):
         j = Job([], [DacapoHarness() >> Print()])
         with self.assertRaises(ValueError):
@@ -190,6 +295,39 @@ class RunServerPipelineTest(unittest.TestCase):
         j = Job([], [])
         self.assertEqual(j.run_server_pipeline(), None)
 
+    def test_not_strict(self):
+        sink = MockPipelineElement()
+        sink.inputs = Types(('results', dict, int))
+        self.data['a'] = 'one'
+
+        j = Job([], [Edge(self.receive, sink)], strict=False)
+        j.receive = self.j.receive
+        j.run_server_pipeline()
+        # the sink itself still checks every element
+        self.assertTrue(sink.validate_elements)
+
+        j = Job([], [Edge(self.receive, sink)])
+        j.receive = self.j.receive
+        with self.assertRaises(TypeCheckError):
+            j.run_server_pipeline()
+
+    def test_not_runnable_sink(self):
+        self.j.server_flow.append(Edge(self.receive, ScalaBench('jython')))
+        for strict in (True, False):
+            self.j.strict = strict
+            with self.assertRaises(ValueError):
+                self.j.run_server_pipeline()
+
+    def test_cached_edge_order(self):
+        starts = [self.receive]
+        order = self.j._edge_order(starts, self.j.server_flow)
+        self.assertIs(self.j._edge_order(starts, self.j.server_flow), order)
+
+        edge = Edge(self.j.server_flow[0].sink, Print())
+        self.j.server_flow.append(edge)
+        self.assertListEqual(self.j._edge_order(starts, self.j.server_flow),
+                             order + [(edge.sink, [edge])])
+
 
 class JobCheckTest(unittest.TestCase):
     def test_valid_job(self):
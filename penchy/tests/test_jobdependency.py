@@ -26,6 +26,25 @@ class EdgeSortTest(unittest.TestCase):
         self.assertIn(edge_order, (edges[::-1],
                                    [edges[2], edges[0], edges[1]]))
 
+    def test_reversed_chain(self):
+        starts = [0]
+        edges = [Edge(i, i + 1) for i in reversed(range(100))]
+        order, edge_order = edgesort(starts, edges)
+        self.assertEqual(order, list(range(1, 101)))
+        self.assertEqual(edge_order, edges[::-1])
+
+    def test_unreachable_source(self):
+        starts = [0]
+        edges = [Edge(0, 1), Edge(2, 1)]
+        with self.assertRaises(ValueError):
+            edgesort(starts, edges)
+
+    def test_edge_into_start(self):
+        starts = [0]
+        edges = [Edge(0, 1), Edge(1, 0)]
+        with self.assertRaises(ValueError):
+            edgesort(starts, edges)
+
 
 class BuildKeysTest(unittest.TestCase):
     def test_multi_sinks(self):
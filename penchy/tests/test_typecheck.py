@@ -52,6 +52,13 @@ class CheckArgsTest(unittest.TestCase):
         # d contains 2 unused inputs
         self.assertEqual(Types().check_input(self.d), 0)
 
+    def test_unchecked_elements(self):
+        self.d['bar'] = ['23']
+        self.assertEqual(self.inputs.check_input(self.d, check_elements=False), 0)
+        self.d['bar'] = 42
+        with self.assertRaises(TypeCheckError):
+            self.inputs.check_input(self.d, check_elements=False)
+
     def test_subtype_of_dict(self):
         inputs = Types(('foo', dict, int),
                        ('bar', dict, list, int))